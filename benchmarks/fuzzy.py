@@ -0,0 +1,57 @@
+"""Compares the ChoiceSet batch scorer with the module level extraction functions.
+
+Run from the repository root with `python -m benchmarks.fuzzy`.
+"""
+
+import random
+from timeit import repeat
+
+from cogs.developer.rtfm import fuzzy
+
+WORDS = (
+    "client bot app command context message guild channel user member role embed "
+    "view button select modal interaction option choice autocomplete webhook thread"
+).split()
+QUERIES = ("guild member", "bot", "slash command option", "webhook.send", "xyz")
+
+
+def make_choices(count: int, seed: int = 0) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        ".".join(rng.choice(WORDS) for _ in range(rng.randint(1, 4)))
+        for _ in range(count)
+    ]
+
+
+def main(count: int = 2000, number: int = 3) -> None:
+    choices = make_choices(count)
+    choice_set = fuzzy.ChoiceSet(choices)
+    print(f"{count} choices, best of {number} runs per query (ms)")
+    print(f"{'scorer':<26}{'extract':>10}{'ChoiceSet':>11}{'speedup':>9}")
+    for scorer in fuzzy.ChoiceSet.SCORERS:
+        old = new = 0.0
+        for query in QUERIES:
+            assert fuzzy.extract(query, choices, scorer=scorer) == choice_set.extract(
+                query, scorer=scorer
+            )
+            old += min(
+                repeat(
+                    lambda: fuzzy.extract(query, choices, scorer=scorer),
+                    number=1,
+                    repeat=number,
+                )
+            )
+            new += min(
+                repeat(
+                    lambda: choice_set.extract(query, scorer=scorer),
+                    number=1,
+                    repeat=number,
+                )
+            )
+        print(
+            f"{scorer.__name__:<26}{old * 1000:>10.1f}{new * 1000:>11.1f}{old / new:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
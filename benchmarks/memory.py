@@ -0,0 +1,51 @@
+"""Reports the memory used by parsed RTFM inventories, as plain dicts and compacted.
+
+Run from the repository root with `python -m benchmarks.memory [directory]`. The
+directory defaults to `data/rtfm`, where the bot stores every inventory in
+`TARGETS` after building them once.
+"""
+
+import sys
+import tracemalloc
+from glob import glob
+from os import path
+
+from cogs.developer.rtfm import TARGETS, Inventory, SphinxObjectFileParser
+
+
+def measure(func, *args):
+    """Return the result of `func(*args)` and the memory it still holds on to."""
+    tracemalloc.start()
+    result = func(*args)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main(directory: str = "data/rtfm") -> None:
+    files = sorted(glob(path.join(directory, "*.inv")))
+    if not files:
+        return print(f"No inventories found in {directory}.")
+
+    print(f"{'target':<16}{'entries':>9}{'dict (KiB)':>12}{'compact (KiB)':>15}")
+    total_dict = total_compact = 0
+    for file_path in files:
+        target = path.basename(file_path)[:-4]
+        url = TARGETS.get(target, "https://example.com")
+        with open(file_path, "rb") as file:
+            raw = file.read()
+
+        entries, dict_size = measure(SphinxObjectFileParser.parse, raw, url)
+        _, compact_size = measure(Inventory, entries, url)
+        total_dict += dict_size
+        total_compact += compact_size
+        print(
+            f"{target:<16}{len(entries):>9}{dict_size / 1024:>12.0f}{compact_size / 1024:>15.0f}"
+        )
+    print(
+        f"{'total':<16}{'':>9}{total_dict / 1024:>12.0f}{total_compact / 1024:>15.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
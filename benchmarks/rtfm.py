@@ -0,0 +1,258 @@
+"""Benchmarks the RTFM path on recorded `objects.inv` files.
+
+Record the fixtures once (this is the only step that needs network access):
+
+    python -m benchmarks.rtfm record
+
+then run the benchmarks offline as often as needed:
+
+    python -m benchmarks.rtfm run [--output results.json]
+
+For every fixture this measures the parse time and peak memory of both
+`SphinxObjectFileReader` and `SphinxObjectFileParser`, the time it takes to
+build a `SearchIndex`, and the p50/p99 latency of `finder`, `SearchIndex` and
+`QueryCache` over every prefix of a corpus of realistic queries, as if they
+were typed into autocomplete. Results are written as JSON so runs can be
+compared with `python -m benchmarks.rtfm compare old.json new.json`.
+"""
+
+import asyncio
+import json
+import platform
+import tracemalloc
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from os import makedirs, path
+from statistics import quantiles
+from time import perf_counter
+
+from cogs.developer.rtfm import (
+    OVERRIDES,
+    TARGETS,
+    QueryCache,
+    SearchIndex,
+    SphinxObjectFileParser,
+    SphinxObjectFileReader,
+    finder,
+)
+
+FIXTURES = path.join(path.dirname(__file__), "fixtures")
+RESULTS = path.join(path.dirname(__file__), "results")
+
+# queries typed into autocomplete for each benchmarked target
+QUERIES = {
+    "python": (
+        "asyncio.gather",
+        "os.path.join",
+        "json.loads",
+        "collections.defaultdict",
+        "str.split",
+        "itertools.chain",
+        "datetime.timedelta",
+        "typing.Optional",
+    ),
+    "numpy": (
+        "numpy.array",
+        "ndarray.reshape",
+        "linalg.norm",
+        "numpy.zeros",
+        "random.Generator",
+        "numpy.concatenate",
+    ),
+    "pandas": (
+        "DataFrame.groupby",
+        "read_csv",
+        "Series.apply",
+        "DataFrame.merge",
+        "to_datetime",
+        "DataFrame.iloc",
+    ),
+    "pycord": (
+        "Bot.slash_command",
+        "Interaction.response",
+        "ApplicationContext.respond",
+        "Embed.add_field",
+        "ui.View",
+        "Member.timeout",
+    ),
+}
+
+
+def prefixes(queries) -> list[str]:
+    """Return every prefix of the queries, in the order they'd be typed."""
+    return [query[:end] for query in queries for end in range(1, len(query) + 1)]
+
+
+def measure(func, *args):
+    """Return the result, duration and peak traced memory of `func(*args)`.
+
+    The function runs twice since tracing memory allocations skews timings.
+    """
+    start = perf_counter()
+    func(*args)
+    duration = perf_counter() - start
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, duration, peak
+
+
+def run_sync(coroutine):
+    """Return the result of a coroutine that never suspends, without an event loop.
+
+    Creating a loop for every query would be measured along with it.
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coroutine.close()
+    raise RuntimeError("the coroutine suspended")
+
+
+def latencies(func, queries) -> dict[str, float]:
+    times = []
+    for query in queries:
+        start = perf_counter()
+        func(query)
+        times.append(perf_counter() - start)
+    percentiles = quantiles(times, n=100, method="inclusive")
+    return {
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "max_ms": max(times) * 1000,
+    }
+
+
+def benchmark(target: str, raw: bytes) -> dict:
+    url = TARGETS[target]
+    entries, reader_time, reader_peak = measure(
+        lambda: SphinxObjectFileReader(raw).parse_object_inv(url)
+    )
+    parsed, parser_time, parser_peak = measure(SphinxObjectFileParser.parse, raw, url)
+    assert parsed == entries, f"the parsers disagree on {target}"
+    index, index_time, index_peak = measure(SearchIndex.from_entries, entries, url)
+
+    queries = prefixes(QUERIES.get(target, QUERIES["python"]))
+    items = list(entries.items())
+    cache = QueryCache()
+    return {
+        "entries": len(entries),
+        "size": len(raw),
+        "parse": {
+            "reader_s": reader_time,
+            "reader_peak_bytes": reader_peak,
+            "parser_s": parser_time,
+            "parser_peak_bytes": parser_peak,
+        },
+        "index": {"build_s": index_time, "peak_bytes": index_peak},
+        "queries": {
+            "count": len(queries),
+            "finder": latencies(
+                lambda query: run_sync(finder(query, items, key=lambda x: x[0])),
+                queries,
+            ),
+            "index": latencies(lambda query: index.search(query, 25), queries),
+            "cache": latencies(
+                lambda query: cache.search(target, index, query, 25), queries
+            ),
+        },
+    }
+
+
+async def record(targets) -> None:
+    from aiohttp import ClientSession
+
+    makedirs(FIXTURES, exist_ok=True)
+    async with ClientSession() as session:
+        for target in targets:
+            url = OVERRIDES.get(target, TARGETS[target] + "/objects.inv")
+            async with session.get(url, raise_for_status=True) as response:
+                raw = await response.read()
+            with open(path.join(FIXTURES, f"{target}.inv"), "wb") as file:
+                file.write(raw)
+            print(f"Recorded {target} ({len(raw)} bytes)")
+
+
+def run(targets, output: str | None) -> None:
+    results = {
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "targets": {},
+    }
+    for target in targets:
+        try:
+            with open(path.join(FIXTURES, f"{target}.inv"), "rb") as file:
+                raw = file.read()
+        except FileNotFoundError:
+            print(f"Skipping {target}, run `python -m benchmarks.rtfm record` first")
+            continue
+        results["targets"][target] = result = benchmark(target, raw)
+        queries = result["queries"]
+        print(
+            f"{target:<8} {result['entries']:>6} entries | "
+            f"parse {result['parse']['reader_s']:.3f}s -> {result['parse']['parser_s']:.3f}s | "
+            f"index {result['index']['build_s']:.3f}s | p50/p99 ms: "
+            + ", ".join(
+                f"{name} {queries[name]['p50_ms']:.2f}/{queries[name]['p99_ms']:.2f}"
+                for name in ("finder", "index", "cache")
+            )
+        )
+
+    if output is None:
+        makedirs(RESULTS, exist_ok=True)
+        output = path.join(
+            RESULTS, f"rtfm-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+        )
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(results, file, indent=2)
+    print(f"Results written to {output}")
+
+
+def compare(old_path: str, new_path: str) -> None:
+    with open(old_path, encoding="utf-8") as file:
+        old = json.load(file)["targets"]
+    with open(new_path, encoding="utf-8") as file:
+        new = json.load(file)["targets"]
+
+    def flatten(data, prefix=""):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                yield from flatten(value, f"{prefix}{key}.")
+            else:
+                yield f"{prefix}{key}", value
+
+    for target in old.keys() & new.keys():
+        new_values = dict(flatten(new[target]))
+        for metric, before in flatten(old[target]):
+            after = new_values.get(metric)
+            if after is None or not before:
+                continue
+            print(
+                f"{target:<8} {metric:<26} {before:>14.4f} {after:>14.4f} {after / before:>7.2f}x"
+            )
+
+
+def main() -> None:
+    parser = ArgumentParser(prog="benchmarks.rtfm")
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name in ("record", "run"):
+        command = commands.add_parser(name)
+        command.add_argument("targets", nargs="*", default=[*QUERIES])
+    commands.choices["run"].add_argument("-o", "--output")
+    command = commands.add_parser("compare")
+    command.add_argument("old")
+    command.add_argument("new")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.targets))
+    elif args.command == "run":
+        run(args.targets, args.output)
+    else:
+        compare(args.old, args.new)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,77 @@
+import asyncio
+import json
 import re
 import textwrap
+from heapq import nsmallest
 from io import BytesIO
-from typing import Type, overload
+from os import getenv, remove
+from typing import Any
+from urllib.parse import quote, unquote
 
 import discord
-from discord.ext.pages import Paginator
+from aiohttp import ClientTimeout
+from discord.ext.pages import Page, Paginator
 from discord.utils import as_chunks
 
-from core import Cog, GuildModel
-
-from .rtfm import OVERRIDES, TARGETS, SphinxObjectFileReader, create_buttons, finder
+from core import Cog, GitHubRateLimited
+
+from .files import FileCache
+from .github import SHA_RE, IssueCache, RefCache
+from .rtfm import (
+    ALL,
+    OVERRIDES,
+    TARGETS,
+    BuildScheduler,
+    InventoryEntry,
+    InventoryExecutor,
+    InventoryStore,
+    QueryCache,
+    SearchIndex,
+    SphinxObjectFileParser,
+    build_index_file,
+    create_buttons,
+)
 
 __all__ = ("setup",)
 
+# the quantifiers are bounded by what they can't match, so a failed match can't backtrack
 GITHUB_RE = re.compile(
     r"https://github\.com/(?P<repo>[a-zA-Z0-9-]+/[\w.-]+)/blob/"
-    r"(?P<path>[^#>]+)(\?[^#>]+)?(#L(?P<start_line>\d+)(([-~:]|(\.\.))L(?P<end_line>\d+))?)"
+    r"(?P<path>[^#>?\s]+)(\?[^#>\s]*)?(#L(?P<start_line>\d+)(([-~:]|(\.\.))L(?P<end_line>\d+))?)"
 )
 
 GITHUB_GIST_RE = re.compile(
     r"https://gist\.github\.com/([a-zA-Z0-9-]+)/(?P<gist_id>[a-zA-Z0-9]+)/*"
-    r"(?P<revision>[a-zA-Z0-9]*)/*#file-(?P<file_path>[^#>]+?)(\?[^#>]+)?"
+    r"(?P<revision>(?<=/)[a-zA-Z0-9]+|)/*#file-(?P<file_path>[^#>\s]+?)(\?[^#>\s]+)?"
     r"(-L(?P<start_line>\d+)([-~:]L(?P<end_line>\d+))?)"
 )
 
+# the line boundaries of `str.splitlines` in UTF-8, so bare "\r" ends a line as well
+LINE_BREAK_RE = re.compile(rb"\r\n|[\n\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+
+# the maximum amount of permalinks fetched from a single message
+MAX_SNIPPETS = 5
+
+# GitHub limits organization names to 39 characters and repository names to 100
+# the lookarounds reject over-long names and numbers instead of matching a part of them
 PULL_HASH_REGEX = re.compile(
-    r"(?:(?P<org>(?:[A-Za-z]|\d|-)+)\/)?(?P<repo>(?:[A-Za-z]|\d|-|_|\.)+)?(?:#)(?P<index>[0-9]+)"
+    r"(?<![\w./-])(?:(?P<org>[A-Za-z\d-]{1,39})/)?(?P<repo>[A-Za-z\d_.-]{1,100})?"
+    r"#(?P<index>\d{1,7})(?!\d)"
 )
 
 
 async def rtfm_autocomplete(ctx: discord.AutocompleteContext):
     assert isinstance(ctx.cog, Developer)
-    results = await ctx.cog.get_rtfm_results(ctx.options["documentation"], ctx.value)
+    if ctx.options["documentation"] == ALL:
+        return [
+            discord.OptionChoice(f"{key} ({target})"[:100], key[:100])
+            for target, key, _ in await ctx.cog.search_all_documentation(
+                ctx.value, limit=25
+            )
+        ]
+    results = await ctx.cog.get_rtfm_results(
+        ctx.options["documentation"], ctx.value, limit=25
+    )
     return [key for key, _ in results] if results else []
 
 
@@ -74,63 +114,87 @@ class Developer(Cog):
 
     def __init__(self, bot):
         super().__init__(bot)
+        bot.ingress.register("github", GITHUB_RE, needles=("https://github.com/",))
+        bot.ingress.register(
+            "gist", GITHUB_GIST_RE, needles=("https://gist.github.com/",)
+        )
+        bot.ingress.register("issues", PULL_HASH_REGEX, needles=("#",))
         self.pattern_handlers = [
-            (GITHUB_RE, self.fetch_snippet),
-            (GITHUB_GIST_RE, self.fetch_gist_snippet),
+            ("github", self.fetch_snippet),
+            ("gist", self.fetch_gist_snippet),
         ]
-        self.rtfm_cache: dict[str, dict] = {}
+        self.refs = RefCache(self._fetch_all)
+        self.issues = IssueCache(self.bot.github)
+        self.files = FileCache(self._request)
+        # shared by every message so a burst of snippets can't flood GitHub
+        self.snippet_semaphore = asyncio.Semaphore(
+            int(getenv("SNIPPET_CONCURRENCY", 4))
+        )
+        self.rtfm_cache: dict[str, SearchIndex] = {}
+        self.rtfm_store = InventoryStore()
+        self.rtfm_queries = QueryCache()
+        # the latest match of every documentation searched by `ALL`
+        self.rtfm_matches: dict[str, asyncio.Task] = {}
+        self.rtfm_executor = InventoryExecutor()
+        self.rtfm_scheduler = BuildScheduler(self.build_documentation)
         self.bot.loop.create_task(self.build_docs())
 
-    @overload
-    async def _fetch(self, url: str, response_type: Type[str]) -> str:
-        ...
+    def cog_unload(self) -> None:
+        self.bot.ingress.unregister("github", "gist", "issues")
+        self.rtfm_scheduler.stop()
+        self.rtfm_executor.shutdown()
 
-    @overload
-    async def _fetch(self, url: str, response_type: Type[list]) -> list:
-        ...
+    async def _request(
+        self, url: str, headers: dict[str, str], lines: int | None = None
+    ) -> tuple[int, bytes | None, str | None, bool]:
+        """Makes a conditional HTTP request to GitHub.
 
-    @overload
-    async def _fetch(self, url: str, response_type: Type[dict]) -> dict:
-        ...
-
-    async def _fetch(self, url: str, response_type):
-        """Makes an HTTP request to GitHub using aiohttp."""
-        async with self.bot.http_session.get(
-            url,
-            raise_for_status=True,
-            headers={"Accept": "application/vnd.github.v3.raw"},
+        Returns the status, the body, the ETag and whether the entire body was read.
+        If `lines` is given, reading stops as soon as that many lines were received.
+        """
+        async with self.bot.github.get(
+            url, {"Accept": "application/vnd.github.v3.raw", **headers}
         ) as response:
-            if response_type is str:
-                return await response.text()
-            return await response.json()
-
-    def find_reference(self, path: str, refs: list) -> tuple:
-        """Loops through all branches and tags to find the required reference."""
-        # Base case: there is no slash in the branch name
-        ref, file_path = path.split("/", 1)
-        # In case there are slashes in the branch name, loop through all branches and tags
-        for possible_ref in refs:
-            if path.startswith(possible_ref["name"] + "/"):
-                ref = possible_ref["name"]
-                file_path = path[len(ref) + 1 :]
-                break
-        return ref, file_path
+            if response.status == 304:
+                return 304, None, None, True
+            chunks = []
+            newlines = 0
+            async for chunk in response.content.iter_chunked(16 * 1024):
+                chunks.append(chunk)
+                if lines is not None:
+                    newlines += chunk.count(b"\n")
+                    if newlines >= lines:
+                        break
+            else:
+                return 200, b"".join(chunks), response.headers.get("ETag"), True
+            return 200, b"".join(chunks), response.headers.get("ETag"), False
+
+    async def _fetch_all(self, url: str) -> list:
+        """Fetches every page of a paginated GitHub API endpoint."""
+        results = []
+        next_url = f"{url}?per_page=100"
+        while next_url:
+            response = await self.bot.github.fetch(next_url)
+            results += response.json()
+            next_url = response.links.get("next")
+        return results
 
     async def fetch_snippet(
         self, repo: str, path: str, start_line: str, end_line: str
     ) -> tuple[str, ...] | None:
         """Fetches a snippet from a GitHub repo."""
-        branches = await self._fetch(
-            f"https://api.github.com/repos/{repo}/branches",
-            list,
-        )
-        tags = await self._fetch(f"https://api.github.com/repos/{repo}/tags", list)
-        refs = branches + tags
-        ref, file_path = self.find_reference(path, refs)
-
-        file_contents = await self._fetch(
-            f"https://api.github.com/repos/{repo}/contents/{file_path}?ref={ref}",
-            str,
+        # dot segments would be resolved away and could point anywhere in the API
+        path = unquote(path)
+        if {".", ".."} & {*repo.split("/"), *path.split("/")}:
+            return None
+        ref, file_path = await self.refs.find_reference(repo, path)
+
+        file_contents = await self.files.get(
+            (repo.lower(), ref, file_path),
+            f"https://api.github.com/repos/{repo}/contents/{quote(file_path)}"
+            f"?ref={quote(ref, safe='')}",
+            immutable=bool(SHA_RE.fullmatch(ref)),
+            lines=self.line_range(start_line, end_line)[1],
         )
         return self.snippet_to_codeblock(file_contents, file_path, start_line, end_line)
 
@@ -143,53 +207,77 @@ class Developer(Cog):
         end_line: str,
     ) -> tuple[str, ...] | None:
         """Fetches a snippet from a GitHub gist."""
-        gist_json = await self._fetch(
-            f"https://api.github.com/gists/{gist_id}{f'/{revision}' if len(revision) > 0 else ''}",
-            dict,
+        gist_json = json.loads(
+            await self.files.get(
+                ("gist", gist_id, revision),
+                f"https://api.github.com/gists/{gist_id}{f'/{revision}' if len(revision) > 0 else ''}",
+                immutable=len(revision) > 0,
+            )
         )
 
         for gist_file in gist_json["files"]:
             if file_path == gist_file.lower().replace(".", "-"):
-                file_contents = await self._fetch(
+                # raw URLs contain the revision, so their content never changes
+                file_contents = await self.files.get(
+                    ("gist", gist_json["files"][gist_file]["raw_url"]),
                     gist_json["files"][gist_file]["raw_url"],
-                    str,
+                    immutable=True,
+                    lines=self.line_range(start_line, end_line)[1],
                 )
                 return self.snippet_to_codeblock(
                     file_contents, gist_file, start_line, end_line
                 )
 
+    @staticmethod
+    def line_range(start_line: str, end_line: str | None) -> tuple[int, int]:
+        """Converts the lines of a permalink to an ordered range."""
+        if end_line is None:
+            start = end = int(start_line)
+        else:
+            start = int(start_line)
+            end = int(end_line)
+        return (end, start) if start > end else (start, end)
+
     def snippet_to_codeblock(
-        self, file_contents: str, file_path: str, start_line: str, end_line: str
+        self, file_contents: bytes, file_path: str, start_line: str, end_line: str
     ) -> tuple[str, ...] | None:
         """
-        Given the entire file contents and target lines, creates a code block.
-        First, we split the file contents into a list of lines and then keep and join only the required
-        ones together.
+        Given the file contents (at least up to the last line) and target lines, creates a code block.
+        First, we find where the required lines start and end by counting line breaks, and only
+        decode those.
         We then dedent the lines to look nice, and replace all ` characters with `\u200b to prevent
         markdown injection.
         Finally, we surround the code with ``` characters.
         """
-        if end_line is None:
-            start = end = int(start_line)
-        else:
-            start = int(start_line)
-            end = int(end_line)
-
-        split_file_contents = file_contents.splitlines()
-
-        if start > end:
-            start, end = end, start
-        if start > len(split_file_contents) or end < 1:
+        start, end = self.line_range(start_line, end_line)
+        if end < 1:
             return
         start = max(1, start)
-        end = min(len(split_file_contents), end)
+
+        # Finds the offset the first line starts at
+        next_line = LINE_BREAK_RE.search
+        begin = 0
+        for _ in range(start - 1):
+            if not (match := next_line(file_contents, begin)):
+                begin = 0
+                break
+            begin = match.end()
+        if not begin and start > 1 or begin >= len(file_contents):
+            return
+
+        # Finds the offset after the last line, stopping early at the end of the file
+        stop = begin
+        line = start - 1
+        while line < end and stop < len(file_contents):
+            line += 1
+            match = next_line(file_contents, stop)
+            stop = match.end() if match else len(file_contents)
+        end = line
+
+        lines = file_contents[begin:stop].decode("utf-8", "replace").splitlines()
 
         # Gets the code lines, dedents them, and inserts zero-width spaces to prevent Markdown injection
-        code = (
-            textwrap.dedent("\n".join(split_file_contents[start - 1 : end]))
-            .rstrip()
-            .replace("`", "`\u200b")
-        )
+        code = textwrap.dedent("\n".join(lines)).rstrip().replace("`", "`\u200b")
 
         # Extracts the code language and checks whether it's a "valid" language
         language = (
@@ -207,17 +295,57 @@ class Developer(Cog):
             title = f"`{file_path}` lines {start} to {end}\n"
         return title, code, language
 
-    async def parse_snippets(self, content: str) -> tuple[str, ...] | None:
-        """Parses message content and return code snippet information."""
-        for pattern, handler in self.pattern_handlers:
-            if snippet := pattern.search(content):
-                return await handler(**snippet.groupdict())
+    def find_snippets(self, content: str) -> list[tuple[Any, re.Match[str]]]:
+        """Finds the distinct permalinks in message content, in order of appearance."""
+        matches = sorted(
+            (
+                (handler, match)
+                for name, handler in self.pattern_handlers
+                for match in self.bot.ingress.scan(name, content)
+            ),
+            key=lambda item: item[1].start(),
+        )
+        links = {match[0]: (handler, match) for handler, match in matches}
+        return list(links.values())[:MAX_SNIPPETS]
+
+    async def _fetch_snippet(self, handler, match: re.Match[str]):
+        async with self.snippet_semaphore:
+            return await handler(**match.groupdict())
+
+    async def fetch_snippets(
+        self, snippets: list[tuple[Any, re.Match[str]]]
+    ) -> list[tuple[str, tuple[str, ...] | None | BaseException]]:
+        """Fetches every code snippet found by `find_snippets` concurrently.
+
+        Returns each permalink with its snippet information, or the exception
+        raised while fetching it.
+        """
+        results = await asyncio.gather(
+            *(self._fetch_snippet(handler, match) for handler, match in snippets),
+            return_exceptions=True,
+        )
+        return [(match[0], result) for (_, match), result in zip(snippets, results)]
+
+    @staticmethod
+    def render_snippet(
+        link: str, snippet: tuple[str, ...] | None | BaseException
+    ) -> tuple[str, str | None, str]:
+        """Returns the title, code and language to display for a snippet."""
+        if isinstance(snippet, GitHubRateLimited):
+            return f"Couldn't fetch the snippet from <{link}>: {snippet}\n", None, ""
+        if isinstance(snippet, BaseException):
+            return f"Couldn't fetch the snippet from <{link}>.\n", None, ""
+        if not snippet:
+            return f"Couldn't find the lines linked in <{link}>.\n", None, ""
+        if not snippet[1]:
+            return f"{snippet[0]}The snippet is empty.\n", None, ""
+        return snippet[0], snippet[1], snippet[2]
 
     @discord.message_command(name="Fetch Code Snippet")
     async def fetch_code_snippet(
         self, ctx: discord.ApplicationContext, message: discord.Message
     ):
-        """Fetch and display a code snippet from a GitHub permalink."""
+        """Fetch and display the code snippets from GitHub permalinks."""
         assert isinstance(ctx.author, discord.Member) and isinstance(
             ctx.channel, discord.TextChannel
         )
@@ -231,24 +359,50 @@ class Developer(Cog):
                 ephemeral=True,
             )
 
-        snippet = await self.parse_snippets(message.content)
-        if not snippet:
+        if not (found := self.find_snippets(message.content)):
             return await ctx.respond(
                 "There were no GitHub snippet links found in this message.",
                 ephemeral=True,
             )
-        if not snippet[1]:
-            return await ctx.respond("The snippet is empty.", ephemeral=True)
-        if len(content := f"{snippet[0]}```{snippet[2]}\n{snippet[1]}```") <= 2000:
+        # fetching can wait for GitHub's rate limit past the interaction deadline
+        await ctx.defer()
+        snippets = await self.fetch_snippets(found)
+        if len(snippets) == 1:
+            snippet = snippets[0][1]
+            if isinstance(snippet, BaseException):
+                raise snippet
+            # the deferred response is public, so these can't be ephemeral anymore
+            if not snippet:
+                return await ctx.respond(
+                    "There were no GitHub snippet links found in this message."
+                )
+            if not snippet[1]:
+                return await ctx.respond("The snippet is empty.")
+
+        rendered = [self.render_snippet(*snippet) for snippet in snippets]
+        contents = [
+            f"{title}```{language}\n{code}```" if code else title
+            for title, code, language in rendered
+        ]
+        if len(content := "\n".join(contents)) <= 2000:
             return await ctx.respond(content, view=Delete(ctx.author))
-        await ctx.respond(
-            snippet[0],
-            file=discord.File(
-                BytesIO(snippet[1].encode("utf-8")),
-                f"output.{snippet[2]}",
-            ),
-            view=Delete(ctx.author),
-        )
+        if len(rendered) == 1:
+            title, code, language = rendered[0]
+            return await ctx.respond(
+                title,
+                file=discord.File(BytesIO(code.encode("utf-8")), f"output.{language}"),
+                view=Delete(ctx.author),
+            )
+
+        # too long to be combined, show one snippet per page instead
+        pages = []
+        for content, (title, code, language) in zip(contents, rendered):
+            if len(content) <= 2000 or not code:
+                pages.append(Page(content=content))
+                continue
+            file = discord.File(BytesIO(code.encode("utf-8")), f"output.{language}")
+            pages.append(Page(content=title, files=[file]))
+        await Paginator(pages).respond(ctx.interaction)
 
     @discord.message_command(
         name="Link GitHub Issues",
@@ -258,10 +412,11 @@ class Developer(Cog):
         self, ctx: discord.ApplicationContext, message: discord.Message
     ):
         """Extract GitHub issue and pull request links mentioned with #."""
-        links = []
-        data = await GuildModel.get_or_none(id=ctx.guild_id)
-        for org, repo, index in {*PULL_HASH_REGEX.findall(message.content)[:10]}:
-            data_split = data and data.repo.split("/") or []
+        mentions = []
+        config = await self.bot.guild_configs.get(ctx.guild_id)
+        data_split = config and config.repo and config.repo.split("/") or []
+        matches = self.bot.ingress.scan("issues", message.content)
+        for org, repo, index in (match.groups() for match in matches[:10]):
             if not repo and len(data_split) >= 1:
                 repo = data_split[-1]
                 if not org and len(data_split) == 2:
@@ -271,15 +426,40 @@ class Developer(Cog):
                     "You have to either configure or mention both a GitHub repository "
                     "and the owner organization in the following format: `org/repo`."
                 )
-            links.append(f"https://github.com/{org}/{repo}/pull/{index}")
+            if (mention := (org, repo, int(index))) not in mentions:
+                mentions.append(mention)
 
-        if not links:
+        if not mentions:
             return await ctx.respond(
                 "No GitHub issue or pull request mentions (ex. #123) found."
             )
-        await ctx.respond(
-            links[0] if len(links) == 1 else "\n".join(f"<{link}>" for link in links)
-        )
+        await ctx.defer()
+        issues = await self.issues.resolve(mentions)
+        lines = []
+        for mention in mentions:
+            org, repo, number = mention
+            if mention not in issues:
+                # couldn't be fetched, link it without knowing what it is
+                lines.append(f"<https://github.com/{org}/{repo}/pull/{number}>")
+            elif (issue := issues[mention]) is None:
+                lines.append(f"`{org}/{repo}#{number}` doesn't exist.")
+            else:
+                path = "pull" if issue.pull_request else "issues"
+                title = discord.utils.escape_markdown(issue.title[:100])
+                lines.append(
+                    f"[{org}/{repo}#{number}](<https://github.com/{org}/{repo}/{path}/{number}>) "
+                    f"{issue.state} {issue.kind}: {title}"
+                )
+
+        # long titles can make the lines exceed a single message
+        pages = [""]
+        for line in lines:
+            if len(pages[-1]) + len(line) + 1 > 2000:
+                pages.append("")
+            pages[-1] += f"\n{line}" if pages[-1] else line
+        if len(pages) == 1:
+            return await ctx.respond(pages[0])
+        await Paginator([Page(content=page) for page in pages]).respond(ctx.interaction)
 
     @discord.slash_command(contexts={discord.InteractionContextType.guild})
     @discord.default_permissions(manage_guild=True)
@@ -299,38 +479,162 @@ class Developer(Cog):
             return await ctx.respond(
                 "The name of the repository can't be longer than 50 letters."
             )
-        await GuildModel.update_or_create(id=ctx.guild_id, defaults={"repo": repo})
+        await self.bot.guild_configs.update(ctx.guild_id, repo=repo)
         await ctx.respond(
             f"The default GitHub repository for pr and issue linking is now `{repo}`."
         )
 
     async def build_docs(self) -> None:
+        # serve the inventories stored on disk right away, then revalidate them
+        entries = await asyncio.to_thread(self.rtfm_store.load, TARGETS)
+        await asyncio.gather(
+            *(
+                self.load_stored_documentation(target)
+                for target, entry in entries.items()
+                if entry.url == TARGETS[target]
+            )
+        )
         await self.bot.wait_until_ready()
-        for target in TARGETS:
-            self.bot.loop.create_task(self.build_documentation((target)))
+        self.rtfm_scheduler.start(TARGETS)
+
+    def set_documentation(self, target: str, index: SearchIndex) -> None:
+        self.rtfm_cache[target] = index
+        self.rtfm_queries.invalidate(target)
+
+    async def load_stored_documentation(self, target: str) -> bool:
+        """Load the stored index of a target if it isn't loaded yet.
+
+        Indexes written by an incompatible version are built again from the
+        stored inventory file instead of downloading it.
+        """
+        if target in self.rtfm_cache:
+            return True
+        index = await asyncio.to_thread(self.rtfm_store.read_index, target)
+        if not index:
+            entry = self.rtfm_store.get(target)
+            if not (entry and (raw := self.rtfm_store.raw_path(target))):
+                return False
+            try:
+                index = await self.rtfm_executor.run(
+                    target, build_index_file, raw, entry.url
+                )
+            except Exception:
+                # the stored file is unusable as well, download it again
+                return False
+            await asyncio.to_thread(self.rtfm_store.save_index, target, index)
+        self.set_documentation(target, index)
+        return True
 
     async def build_documentation(self, target: str) -> None:
         url = TARGETS[target]
-        req = await self.bot.http_session.get(
-            OVERRIDES.get(target, url + "/objects.inv")
-        )
-        if req.status != 200:
-            raise discord.ApplicationCommandError(
-                f"Failed to build RTFM cache for {target}"
+        stored = self.rtfm_store.get(target)
+        if stored and (
+            stored.url != url or not await self.load_stored_documentation(target)
+        ):
+            stored = None
+        async with self.bot.http_session.get(
+            OVERRIDES.get(target, url + "/objects.inv"),
+            headers=stored.conditional_headers if stored else None,
+            timeout=ClientTimeout(total=self.rtfm_scheduler.timeout),
+        ) as req:
+            if req.status == 304 and stored:
+                return
+            if req.status != 200:
+                raise discord.ApplicationCommandError(
+                    f"Failed to build RTFM cache for {target}"
+                )
+            # without an executor, parse the inventory while it's being downloaded
+            parser = SphinxObjectFileParser(url) if self.rtfm_executor.inline else None
+            hasher = self.rtfm_store.hasher()
+            # the body goes straight to disk, only a chunk of it is held in memory
+            download = self.rtfm_store.download_path(target)
+            file = await asyncio.to_thread(open, download, "wb")
+            try:
+                async for chunk in req.content.iter_chunked(
+                    SphinxObjectFileParser.BUFSIZE
+                ):
+                    if parser:
+                        parser.feed(chunk)
+                    hasher.update(chunk)
+                    await asyncio.to_thread(file.write, chunk)
+            finally:
+                await asyncio.to_thread(file.close)
+            etag = req.headers.get("ETag")
+            last_modified = req.headers.get("Last-Modified")
+
+        digest = hasher.hexdigest()
+        if stored and stored.digest == digest:
+            # the validators changed but the content didn't, there's no need to index it again
+            stored.etag, stored.last_modified = etag, last_modified
+            await asyncio.to_thread(remove, download)
+            return await asyncio.to_thread(self.rtfm_store.update, target, stored)
+
+        if parser:
+            index = await self.rtfm_executor.run(
+                target, SearchIndex.from_entries, parser.close(), url
             )
-        self.rtfm_cache[target] = SphinxObjectFileReader(
-            await req.read()
-        ).parse_object_inv(url)
+        else:
+            # workers read the file themselves instead of receiving its bytes
+            index = await self.rtfm_executor.run(
+                target, build_index_file, download, url
+            )
+        self.set_documentation(target, index)
+        await asyncio.to_thread(
+            self.rtfm_store.save,
+            target,
+            download,
+            InventoryEntry(url, digest, etag, last_modified),
+            index,
+        )
 
-    async def get_rtfm_results(self, target: str, query: str) -> list:
-        if not (cached := self.rtfm_cache.get(target)):
+    async def get_rtfm_results(
+        self, target: str, query: str, limit: int | None = None
+    ) -> list[tuple[str, str]]:
+        if not (index := self.rtfm_cache.get(target)):
             return []
-        results = await finder(
-            query,
-            list(cached.items()),
-            key=lambda x: x[0],
+        # matching a short query takes milliseconds on big inventories
+        return await asyncio.to_thread(
+            self.rtfm_queries.search, target, index, query, limit
         )
-        return results
+
+    async def search_all_documentation(
+        self, query: str, limit: int = 100, timeout: float = 2
+    ) -> list[tuple[str, str, str]]:
+        """Search every built documentation and merge the best `(target, key, url)` results.
+
+        Documentations that aren't built yet, are still matching an earlier query
+        or don't finish within the timeout are left out, so autocomplete always
+        responds in time.
+        """
+        indexes = self.rtfm_cache.copy()
+        tasks = {}
+        for target, index in indexes.items():
+            # a match that timed out before still occupies a thread, don't add another
+            if (pending := self.rtfm_matches.get(target)) and not pending.done():
+                continue
+            task = asyncio.create_task(
+                asyncio.to_thread(self.rtfm_queries.match, target, index, query)
+            )
+            self.rtfm_matches[target] = task
+            tasks[task] = target
+        if not tasks:
+            return []
+        done, _ = await asyncio.wait(tasks, timeout=timeout)
+
+        # only the best results of each documentation can make it into the merged results
+        candidates = []
+        for task in done:
+            if task.exception():
+                continue
+            target = tasks[task]
+            ids = task.result()[:limit]
+            for sort_key, i in zip(indexes[target].sort_keys(query, ids), ids):
+                candidates.append((*sort_key, target, i))
+
+        return [
+            (target, *indexes[target].results((i,))[0])
+            for *_, target, i in nsmallest(limit, candidates)
+        ]
 
     @discord.command(
         integration_types={
@@ -346,7 +650,7 @@ class Developer(Cog):
     @discord.option(
         "documentation",
         description="The documentation to search through.",
-        choices=[*TARGETS.keys()],
+        choices=[ALL, *TARGETS.keys()],
     )
     @discord.option(
         "query", description="The search query.", autocomplete=rtfm_autocomplete
@@ -357,23 +661,35 @@ class Developer(Cog):
         documentation: str,
         query: str,
     ):
-        """Search through a specific documentation."""
-        if not (results := await self.get_rtfm_results(documentation, query)):
+        """Search through a specific documentation, or all of them."""
+        if documentation == ALL:
+            title = "Searched in all documentations"
+            lines = [
+                f"[`{key}`]({url}) ({target})"
+                for target, key, url in await self.search_all_documentation(query)
+            ]
+        else:
+            title = f"Searched in {documentation}"
+            lines = [
+                f"[`{key}`]({url})"
+                for key, url in await self.get_rtfm_results(documentation, query)
+            ]
+        if not lines:
             return await ctx.respond("Couldn't find any results")
 
-        if len(results) <= 15:
+        if len(lines) <= 15:
             embed = discord.Embed(
-                title=f"Searched in {documentation}",
-                description="\n".join([f"[`{key}`]({url})" for key, url in results]),
+                title=title,
+                description="\n".join(lines),
                 color=discord.Color.blurple(),
             )
             return await ctx.respond(embed=embed)
 
-        chunks = as_chunks(iter(results), 15)
+        chunks = as_chunks(iter(lines), 15)
         embeds = [
             discord.Embed(
-                title=f"Searched in {documentation}",
-                description="\n".join([f"[`{key}`]({url})" for key, url in chunk]),
+                title=title,
+                description="\n".join(chunk),
                 color=discord.Color.blurple(),
             )
             for chunk in chunks
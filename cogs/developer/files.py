@@ -0,0 +1,211 @@
+import asyncio
+import json
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from hashlib import sha256
+from os import getenv, listdir, makedirs, path, remove, replace, stat, utime
+from threading import Lock
+from time import monotonic
+
+from core import SingleFlight
+
+__all__ = ("CachedFile", "FileCache")
+
+
+@dataclass
+class CachedFile:
+    """The content of a fetched file, or its first lines if it wasn't read entirely."""
+
+    content: bytes
+    etag: str | None
+    immutable: bool
+    complete: bool = True
+    expires: float = 0
+    lines: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.lines = self.content.count(b"\n")
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def covers(self, lines: int | None) -> bool:
+        """Whether the cached content contains the given amount of lines."""
+        return self.complete or (lines is not None and self.lines >= lines)
+
+
+class FileCache:
+    """An LRU cache of fetched files with a byte budget.
+
+    Files fetched at an immutable revision, such as a commit hash, are kept until
+    they're evicted. Other files expire after a short TTL and are then
+    revalidated with their ETag. When `SNIPPET_CACHE_DIR` is set, files are
+    also written to that directory so they survive restarts. The budget is read
+    from `SNIPPET_CACHE_BYTES` and defaults to 16 MiB, it applies to the memory
+    and the directory separately. Files on disk are used in the order of their
+    modification times, which reads update.
+
+    Requests can ask for only the first lines of a file, in which case only
+    those need to be downloaded and cached. Concurrent requests for the same
+    lines of a file share a single fetch.
+    """
+
+    def __init__(
+        self,
+        request,
+        *,
+        max_bytes: int | None = None,
+        ttl: float = 60,
+        directory: str | None = None,
+    ) -> None:
+        self.request = request
+        self.max_bytes = max_bytes or int(getenv("SNIPPET_CACHE_BYTES", 16 * 2**20))
+        self.ttl = ttl
+        self.directory = directory or getenv("SNIPPET_CACHE_DIR")
+        self.files: OrderedDict[tuple, CachedFile] = OrderedDict()
+        self.size = 0
+        # the sizes of the files in the directory, read from it on first use
+        self.disk: OrderedDict[str, int] | None = None
+        self.disk_size = 0
+        # reads and writes of the directory run in threads
+        self.disk_lock = Lock()
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.flights = SingleFlight()
+
+    def _path(self, key: tuple) -> str:
+        assert self.directory
+        return path.join(self.directory, sha256(repr(key).encode()).hexdigest())
+
+    def _scan(self) -> OrderedDict[str, int]:
+        """Return the files in the directory, least recently used first."""
+        assert self.directory
+        if self.disk is not None:
+            return self.disk
+        files = []
+        for name in listdir(self.directory) if path.isdir(self.directory) else ():
+            if name.endswith((".json", ".tmp")):
+                continue
+            file_path = path.join(self.directory, name)
+            try:
+                info = stat(file_path)
+                size = info.st_size + stat(file_path + ".json").st_size
+            except OSError:
+                continue
+            files.append((info.st_mtime, file_path, size))
+        self.disk = OrderedDict(
+            (file_path, size) for _, file_path, size in sorted(files)
+        )
+        self.disk_size = sum(self.disk.values())
+        return self.disk
+
+    def _touch(self, file_path: str) -> None:
+        """Mark a file in the directory as recently used."""
+        disk = self._scan()
+        if file_path in disk:
+            disk.move_to_end(file_path)
+            try:
+                utime(file_path)
+            except OSError:
+                pass
+
+    def _add(self, file_path: str, size: int) -> None:
+        """Count a written file and evict the least recently used ones over budget."""
+        disk = self._scan()
+        self.disk_size += size - disk.pop(file_path, 0)
+        disk[file_path] = size
+        while self.disk_size > self.max_bytes and disk:
+            old_path, old_size = disk.popitem(last=False)
+            self.disk_size -= old_size
+            for suffix in ("", ".json"):
+                try:
+                    remove(old_path + suffix)
+                except OSError:
+                    pass
+
+    def _read(self, key: tuple) -> CachedFile | None:
+        file_path = self._path(key)
+        try:
+            with open(file_path + ".json", encoding="utf-8") as file:
+                meta = json.load(file)
+            with open(file_path, "rb") as file:
+                cached = CachedFile(
+                    file.read(), meta["etag"], meta["immutable"], meta["complete"]
+                )
+        except (OSError, ValueError, KeyError):
+            return None
+        with self.disk_lock:
+            self._touch(file_path)
+        return cached
+
+    def _write(self, key: tuple, cached: CachedFile) -> None:
+        assert self.directory
+        makedirs(self.directory, exist_ok=True)
+        file_path = self._path(key)
+        meta = {
+            "etag": cached.etag,
+            "immutable": cached.immutable,
+            "complete": cached.complete,
+        }
+        meta_data = json.dumps(meta).encode("utf-8")
+        with self.disk_lock:
+            for suffix, data in (("", cached.content), (".json", meta_data)):
+                with open(f"{file_path}{suffix}.tmp", "wb") as file:
+                    file.write(data)
+                replace(f"{file_path}{suffix}.tmp", file_path + suffix)
+            # the file itself is removed again if it's bigger than the budget
+            self._add(file_path, cached.size + len(meta_data))
+
+    def _store(self, key: tuple, cached: CachedFile) -> None:
+        if old := self.files.pop(key, None):
+            self.size -= old.size
+        if cached.size > self.max_bytes:
+            return
+        self.files[key] = cached
+        self.size += cached.size
+        while self.size > self.max_bytes:
+            self.size -= self.files.popitem(last=False)[1].size
+
+    async def get(
+        self, key: tuple, url: str, *, immutable: bool = False, lines: int | None = None
+    ) -> bytes:
+        """Return the content of the file at the URL, cached under the given key.
+
+        If `lines` is given, the content may stop after that many lines.
+        """
+        return await self.flights.run(
+            (key, lines), self._get, key, url, immutable, lines
+        )
+
+    async def _get(
+        self, key: tuple, url: str, immutable: bool, lines: int | None
+    ) -> bytes:
+        cached = self.files.get(key)
+        if cached is None and self.directory:
+            cached = await asyncio.to_thread(self._read, key)
+            if cached:
+                self._store(key, cached)
+        if cached and not cached.covers(lines):
+            # a partial file can't be revalidated to get more of its lines
+            cached = None
+        if cached:
+            self.files.move_to_end(key)
+            if cached.immutable or cached.expires > monotonic():
+                self.hits += 1
+                return cached.content
+
+        headers = {"If-None-Match": cached.etag} if cached and cached.etag else {}
+        status, content, etag, complete = await self.request(url, headers, lines)
+        if status == 304 and cached:
+            self.revalidated += 1
+            cached.expires = monotonic() + self.ttl
+            return cached.content
+
+        self.misses += 1
+        cached = CachedFile(content, etag, immutable, complete, monotonic() + self.ttl)
+        self._store(key, cached)
+        if self.directory:
+            await asyncio.to_thread(self._write, key, cached)
+        return content
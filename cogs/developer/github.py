@@ -0,0 +1,227 @@
+import asyncio
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+
+from aiohttp import ClientError, ClientResponseError
+
+from core import GitHubRateLimited
+
+__all__ = ("Issue", "IssueCache", "RefCache", "RefTrie")
+
+SHA_RE = re.compile(r"[0-9a-fA-F]{40}")
+
+ISSUE_FIELDS = (
+    "__typename ... on Issue { title state } ... on PullRequest { title state }"
+)
+
+
+class RefTrie:
+    """A trie of branch and tag names, split on slashes."""
+
+    __slots__ = ("root",)
+
+    # marks the nodes where a ref name ends
+    END = ""
+
+    def __init__(self, refs=()) -> None:
+        self.root: dict = {}
+        for ref in refs:
+            self.insert(ref)
+
+    def insert(self, ref: str) -> None:
+        node = self.root
+        for segment in ref.split("/"):
+            node = node.setdefault(segment, {})
+        node[self.END] = ref
+
+    def lookup(self, path: str) -> tuple[str, str] | None:
+        """Return the longest ref the path starts with and the file path after it."""
+        segments = path.split("/")
+        node = self.root
+        found = None
+        # the last segment can't be part of the ref, it has to be followed by a file path
+        for i, segment in enumerate(segments[:-1]):
+            if (node := node.get(segment)) is None:
+                break
+            if self.END in node:
+                found = node[self.END], "/".join(segments[i + 1 :])
+        return found
+
+
+class RefCache:
+    """Caches the branches and tags of GitHub repositories for a while.
+
+    Branches and tags are fetched concurrently with every page, and lookups
+    for the same repository share a single fetch. At most `maxsize` repositories
+    are kept, the least recently used ones are dropped first.
+    """
+
+    def __init__(self, fetch_all, ttl: float = 300, maxsize: int = 128) -> None:
+        self.fetch_all = fetch_all
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.repos: OrderedDict[str, tuple[float, asyncio.Task]] = OrderedDict()
+
+    async def _fetch_refs(self, repo: str) -> RefTrie:
+        branches, tags = await asyncio.gather(
+            self.fetch_all(f"https://api.github.com/repos/{repo}/branches"),
+            self.fetch_all(f"https://api.github.com/repos/{repo}/tags"),
+        )
+        return RefTrie(ref["name"] for ref in branches + tags)
+
+    async def get(self, repo: str) -> RefTrie:
+        repo = repo.lower()
+        expires, task = self.repos.get(repo, (0, None))
+        if task is None or expires < monotonic():
+            task = asyncio.create_task(self._fetch_refs(repo))
+            self.repos[repo] = monotonic() + self.ttl, task
+            while len(self.repos) > self.maxsize:
+                self.repos.popitem(last=False)
+        self.repos.move_to_end(repo)
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            # don't cache failures
+            if self.repos.get(repo, (0, None))[1] is task:
+                del self.repos[repo]
+            raise
+
+    async def find_reference(self, repo: str, path: str) -> tuple[str, str]:
+        """Split a permalink path into its ref and file path."""
+        ref, file_path = path.split("/", 1)
+        # a full commit hash is a ref on its own, there's nothing to look up
+        if SHA_RE.fullmatch(ref):
+            return ref, file_path
+        return (await self.get(repo)).lookup(path) or (ref, file_path)
+
+
+@dataclass
+class Issue:
+    """The title and state of a GitHub issue or pull request."""
+
+    title: str
+    state: str  # open, closed or merged
+    pull_request: bool
+
+    @property
+    def kind(self) -> str:
+        return "pull request" if self.pull_request else "issue"
+
+
+class IssueCache:
+    """Caches the titles and states of GitHub issues and pull requests for a while.
+
+    Every uncached mention is resolved at once: with a single GraphQL query if
+    the client has a token, otherwise with concurrent REST requests. Mentions
+    that don't exist are cached as `None`. At most `maxsize` mentions are kept,
+    the least recently used ones are dropped first.
+    """
+
+    def __init__(self, client, ttl: float = 120, maxsize: int = 1024) -> None:
+        self.client = client
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.issues: OrderedDict[tuple[str, str, int], tuple[float, Issue | None]] = (
+            OrderedDict()
+        )
+
+    @staticmethod
+    def _key(org: str, repo: str, number: int) -> tuple[str, str, int]:
+        return org.lower(), repo.lower(), number
+
+    async def _query(self, mentions: list[tuple[str, str, int]]) -> dict:
+        repos: dict[tuple[str, str], list[int]] = {}
+        for org, repo, number in mentions:
+            repos.setdefault((org, repo), []).append(number)
+
+        variables = {}
+        fields = []
+        for i, ((org, repo), numbers) in enumerate(repos.items()):
+            variables[f"owner{i}"], variables[f"name{i}"] = org, repo
+            issues = " ".join(
+                f"i{number}: issueOrPullRequest(number: {number}) {{ {ISSUE_FIELDS} }}"
+                for number in numbers
+            )
+            fields.append(
+                f"r{i}: repository(owner: $owner{i}, name: $name{i}) {{ {issues} }}"
+            )
+        parameters = ", ".join(f"${name}: String!" for name in variables)
+        data = await self.client.graphql(
+            f"query({parameters}) {{ {' '.join(fields)} }}", variables
+        )
+
+        results = {}
+        for i, ((org, repo), numbers) in enumerate(repos.items()):
+            nodes = data.get(f"r{i}") or {}
+            for number in numbers:
+                node = nodes.get(f"i{number}")
+                results[org, repo, number] = node and Issue(
+                    node["title"],
+                    node["state"].lower(),
+                    node["__typename"] == "PullRequest",
+                )
+        return results
+
+    async def _fetch(self, org: str, repo: str, number: int) -> Issue | None:
+        try:
+            response = await self.client.fetch(
+                f"https://api.github.com/repos/{org}/{repo}/issues/{number}"
+            )
+        except ClientResponseError as error:
+            if error.status in (404, 410):
+                return None
+            raise
+        data = response.json()
+        pull_request = data.get("pull_request")
+        return Issue(
+            data["title"],
+            (
+                "merged"
+                if pull_request and pull_request.get("merged_at")
+                else data["state"]
+            ),
+            pull_request is not None,
+        )
+
+    async def _rest(self, mentions: list[tuple[str, str, int]]) -> dict:
+        results = await asyncio.gather(
+            *(self._fetch(*mention) for mention in mentions), return_exceptions=True
+        )
+        return {
+            mention: result
+            for mention, result in zip(mentions, results)
+            if not isinstance(result, BaseException)
+        }
+
+    async def resolve(
+        self, mentions: list[tuple[str, str, int]]
+    ) -> dict[tuple[str, str, int], Issue | None]:
+        """Return the issues mentioned, leaving out the ones that couldn't be fetched."""
+        now = monotonic()
+        results = {}
+        missing = []
+        for mention in mentions:
+            key = self._key(*mention)
+            expires, issue = self.issues.get(key, (0, None))
+            if expires > now:
+                results[mention] = issue
+                self.issues.move_to_end(key)
+            else:
+                self.issues.pop(key, None)
+                missing.append(mention)
+
+        if missing:
+            # GraphQL can resolve every mention at once but needs a token
+            fetch = self._query if self.client.token else self._rest
+            try:
+                fetched = await fetch(missing)
+            except (ClientError, GitHubRateLimited, ValueError):
+                fetched = {}
+            for mention, issue in fetched.items():
+                self.issues[self._key(*mention)] = now + self.ttl, issue
+            while len(self.issues) > self.maxsize:
+                self.issues.popitem(last=False)
+            results.update(fetched)
+        return results
@@ -1,11 +1,29 @@
+from .cache import QueryCache
 from .fuzzy import finder
-from .parser import SphinxObjectFileReader
-from .rtfm import OVERRIDES, TARGETS, create_buttons
+from .index import SearchIndex
+from .inventory import Inventory
+from .parser import SphinxObjectFileParser, SphinxObjectFileReader
+from .rtfm import ALL, OVERRIDES, TARGETS, create_buttons
+from .scheduler import BuildScheduler, BuildStatus
+from .store import InventoryEntry, InventoryStore
+from .worker import InventoryExecutor, build_index, build_index_file
 
 __all__ = (
+    "ALL",
+    "build_index",
+    "build_index_file",
+    "BuildScheduler",
+    "BuildStatus",
     "create_buttons",
     "finder",
+    "Inventory",
+    "InventoryEntry",
+    "InventoryExecutor",
+    "InventoryStore",
+    "SearchIndex",
+    "SphinxObjectFileParser",
     "SphinxObjectFileReader",
     "TARGETS",
     "OVERRIDES",
+    "QueryCache",
 )
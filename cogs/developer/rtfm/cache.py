@@ -0,0 +1,102 @@
+from array import array
+from collections import OrderedDict
+from os import getenv
+from threading import Lock
+
+from .index import SearchIndex
+
+__all__ = ("QueryCache",)
+
+
+class QueryCache:
+    """An LRU cache of RTFM query results with a byte budget shared by all targets.
+
+    Since every entry matching a query also matches all of its prefixes, a
+    query that extends a cached one only needs to look at the cached matches
+    of its longest cached prefix instead of the whole inventory.
+
+    The budget is read from `RTFM_QUERY_CACHE_BYTES` and defaults to 8 MiB.
+    Results larger than an eighth of it, like those of single characters in big
+    inventories, aren't cached so they can't push out everything else.
+
+    Results are only reused with the index they were computed from, so a match
+    that finishes after its target was rebuilt can't store ids of the old index.
+    Matching can run in several threads at once, the cache itself is locked.
+    """
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self.max_bytes = max_bytes or int(getenv("RTFM_QUERY_CACHE_BYTES", 8 * 2**20))
+        self.results: OrderedDict[tuple[str, str], array] = OrderedDict()
+        # the index the cached results of every target belong to
+        self.indexes: dict[str, SearchIndex] = {}
+        self.size = 0
+        self.lock = Lock()
+        self.hits = 0
+        self.narrowed = 0
+        self.misses = 0
+
+    @staticmethod
+    def _size(ids: array) -> int:
+        return len(ids) * ids.itemsize
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "narrowed": self.narrowed,
+            "misses": self.misses,
+            "queries": len(self.results),
+            "bytes": self.size,
+        }
+
+    def _drop(self, target: str) -> None:
+        self.indexes.pop(target, None)
+        for key in [key for key in self.results if key[0] == target]:
+            self.size -= self._size(self.results.pop(key))
+
+    def invalidate(self, target: str) -> None:
+        with self.lock:
+            self._drop(target)
+
+    def match(self, target: str, index: SearchIndex, query: str) -> array:
+        """Return the ids of the entries matching the query, best matches first."""
+        key = target, query
+        with self.lock:
+            if self.indexes.get(target) is not index:
+                self._drop(target)
+                self.indexes[target] = index
+            if (ids := self.results.get(key)) is not None:
+                self.hits += 1
+                self.results.move_to_end(key)
+                return ids
+
+            for end in range(len(query) - 1, 0, -1):
+                prefix = target, query[:end]
+                if (candidates := self.results.get(prefix)) is not None:
+                    self.narrowed += 1
+                    self.results.move_to_end(prefix)
+                    break
+            else:
+                self.misses += 1
+                candidates = None
+
+        # matching runs without the lock, other queries can use the cache meanwhile
+        ids = array("I", index.match(query, candidates))
+        size = self._size(ids)
+        with self.lock:
+            if (
+                self.indexes.get(target) is index
+                and key not in self.results
+                and size <= self.max_bytes // 8
+            ):
+                self.results[key] = ids
+                self.size += size
+                while self.size > self.max_bytes:
+                    self.size -= self._size(self.results.popitem(last=False)[1])
+        return ids
+
+    def search(
+        self, target: str, index: SearchIndex, query: str, limit: int | None = None
+    ) -> list[tuple[str, str]]:
+        """Return the `(key, url)` pairs matching the query, best matches first."""
+        return index.results(self.match(target, index, query)[:limit])
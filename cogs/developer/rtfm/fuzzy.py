@@ -3,8 +3,9 @@
 # This code is under the Mozilla Public License 2.0
 
 import re
+from collections import Counter
 from difflib import SequenceMatcher
-from heapq import nlargest
+from heapq import heappush, heapreplace, nlargest
 
 
 def ratio(a, b):
@@ -76,9 +77,123 @@ def _extraction_generator(query, choices, scorer=quick_ratio, score_cutoff=0):
                 yield (choice, score)
 
 
+def _bound(r):
+    # the highest score a ratio of at most `r` can be reported as
+    return 100 if 100 * r > 99 else int(round(100 * r))
+
+
+class ChoiceSet:
+    """A collection of choices prepared once to be scored against many queries.
+
+    Every choice's character counts are computed up front, which gives the exact
+    `quick_ratio` score and an upper bound for `ratio` and `partial_ratio`.
+    Choices whose bound can't reach `score_cutoff` or beat the lowest of the
+    current top results are skipped without building a `SequenceMatcher`.
+    Scores and ordering are identical to the module level functions.
+    """
+
+    # scorer -> (preprocessor, base scorer)
+    SCORERS = {
+        ratio: (None, ratio),
+        quick_ratio: (None, quick_ratio),
+        partial_ratio: (None, partial_ratio),
+        token_sort_ratio: (_sort_tokens, ratio),
+        quick_token_sort_ratio: (_sort_tokens, quick_ratio),
+        partial_token_sort_ratio: (_sort_tokens, partial_ratio),
+    }
+
+    def __init__(self, choices):
+        try:
+            self.keys = list(choices.keys())
+            self.values = list(choices.values())
+        except AttributeError:
+            self.keys = list(choices)
+            self.values = None
+        self._prepared = {}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _prepare(self, preprocessor):
+        if preprocessor not in self._prepared:
+            strings = (
+                self.keys
+                if preprocessor is None
+                else list(map(preprocessor, self.keys))
+            )
+            self._prepared[preprocessor] = strings, list(map(Counter, strings))
+        return self._prepared[preprocessor]
+
+    def _scores(self, query, scorer, score_cutoff, limit):
+        """Yield `(score, index)` for the choices that could make it into the results."""
+        preprocessor, base = self.SCORERS.get(scorer, (None, None))
+        if base is None:
+            # an unknown scorer can't be bounded
+            for i, choice in enumerate(self.keys):
+                yield scorer(query, choice), i
+            return
+
+        strings, counts = self._prepare(preprocessor)
+        if preprocessor is not None:
+            query = preprocessor(query)
+        query_counts = Counter(query).items()
+        query_length = len(query)
+        heap = []  # the scores of the current top results, when limited
+
+        for i, choice_counts in enumerate(counts):
+            # the amount of characters both strings have in common
+            common = 0
+            for char, count in query_counts:
+                if char_count := choice_counts.get(char):
+                    common += count if count < char_count else char_count
+            length = query_length + len(strings[i])
+
+            if base is quick_ratio:
+                score = int(round(100 * (2.0 * common / length if length else 1.0)))
+            else:
+                if base is ratio:
+                    bound = _bound(2.0 * common / length if length else 1.0)
+                else:
+                    short = min(query_length, len(strings[i]))
+                    bound = (
+                        100 if not short else _bound(2.0 * common / (short + common))
+                    )
+                if bound < score_cutoff or (
+                    limit and len(heap) == limit and bound <= heap[0]
+                ):
+                    continue
+                score = base(query, strings[i])
+
+            if score < score_cutoff:
+                continue
+            if limit:
+                # equal scores keep their original order, so a later one can't replace them
+                if len(heap) < limit:
+                    heappush(heap, score)
+                elif score > heap[0]:
+                    heapreplace(heap, score)
+                else:
+                    continue
+            yield score, i
+
+    def extract(self, query, *, scorer=quick_ratio, score_cutoff=0, limit=10):
+        """The equivalent of `extract` for this set of choices."""
+        results = sorted(
+            self._scores(query, scorer, score_cutoff, limit),
+            key=lambda t: (-t[0], t[1]),
+        )[:limit]
+        if self.values is None:
+            return [(self.keys[i], score) for score, i in results]
+        return [(self.keys[i], score, self.values[i]) for score, i in results]
+
+
 def extract(
     query, choices, *, scorer=quick_ratio, score_cutoff=0, limit: int | None = 10
 ):
+    if isinstance(choices, ChoiceSet):
+        return choices.extract(
+            query, scorer=scorer, score_cutoff=score_cutoff, limit=limit
+        )
     it = _extraction_generator(query, choices, scorer, score_cutoff)
     key = lambda t: t[1]
     if limit is not None:
@@ -87,6 +202,11 @@ def extract(
 
 
 def extract_one(query, choices, *, scorer=quick_ratio, score_cutoff=0):
+    if isinstance(choices, ChoiceSet):
+        matches = choices.extract(
+            query, scorer=scorer, score_cutoff=score_cutoff, limit=1
+        )
+        return matches[0] if matches else None
     it = _extraction_generator(query, choices, scorer, score_cutoff)
     key = lambda t: t[1]
     try:
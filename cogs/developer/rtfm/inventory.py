@@ -0,0 +1,90 @@
+from array import array
+from os import path
+from sys import intern
+
+__all__ = ("Inventory",)
+
+# flags stored in the high bits of a page id
+ABSOLUTE = 1 << 31  # the page is a full URL rather than a path relative to the base
+KEY_ANCHOR = 1 << 30  # the anchor is the key itself, so it isn't stored
+PAGE_MASK = KEY_ANCHOR - 1
+
+
+class Inventory:
+    """A compact, sorted representation of a parsed RTFM inventory.
+
+    Keys are packed into a single string with an array of offsets. Every entry
+    refers to a deduplicated page table by id and keeps its anchor in another
+    packed string, so the base URL and page paths are stored once per target.
+    Full URLs are only rebuilt when an entry is rendered.
+    """
+
+    __slots__ = (
+        "base",
+        "keys",
+        "key_offsets",
+        "pages",
+        "page_ids",
+        "anchors",
+        "anchor_offsets",
+    )
+
+    def __init__(self, entries: dict[str, str], base: str) -> None:
+        self.base = intern(base)
+        prefix = path.join(base, "")
+
+        keys = sorted(entries)
+        self.keys = "".join(keys)
+        self.key_offsets = array("I", [0])
+        self.page_ids = array("I")
+        self.anchor_offsets = array("I", [0])
+        self.pages: list[str] = []
+
+        page_table: dict[str, int] = {}
+        anchors = []
+        anchors_length = 0
+        for key in keys:
+            self.key_offsets.append(self.key_offsets[-1] + len(key))
+
+            url = entries[key]
+            if url.startswith(prefix):
+                flags = 0
+                url = url[len(prefix) :]
+            else:
+                flags = ABSOLUTE
+            page, sep, anchor = url.partition("#")
+            if sep and anchor == key:
+                flags |= KEY_ANCHOR
+                anchor = ""
+            else:
+                anchor = sep + anchor
+
+            if (page_id := page_table.get(page)) is None:
+                page_id = page_table[page] = len(self.pages)
+                self.pages.append(page)
+            self.page_ids.append(page_id | flags)
+
+            anchors.append(anchor)
+            anchors_length += len(anchor)
+            self.anchor_offsets.append(anchors_length)
+        self.anchors = "".join(anchors)
+
+    def __len__(self) -> int:
+        return len(self.page_ids)
+
+    def key(self, i: int) -> str:
+        return self.keys[self.key_offsets[i] : self.key_offsets[i + 1]]
+
+    def url(self, i: int) -> str:
+        page_id = self.page_ids[i]
+        if page_id & KEY_ANCHOR:
+            anchor = "#" + self.key(i)
+        else:
+            anchor = self.anchors[self.anchor_offsets[i] : self.anchor_offsets[i + 1]]
+        location = self.pages[page_id & PAGE_MASK] + anchor
+        return location if page_id & ABSOLUTE else path.join(self.base, location)
+
+    def items(self):
+        """Iterate over the `(key, url)` pairs of the inventory in sorted order."""
+        for i in range(len(self)):
+            yield self.key(i), self.url(i)
@@ -67,30 +67,133 @@ class SphinxObjectFileReader:
             match = entry_regex.match(line.rstrip())
             if not match:
                 continue
+            add_entry(result, projname, url, *match.groups())
 
-            name, directive, prio, location, dispname = match.groups()
-            domain, _, subdirective = directive.partition(":")
-            if directive == "py:module" and name in result:
-                # From the Sphinx Repository:
-                # due to a bug in 1.1 and below,
-                # two inventory entries are created
-                # for Python modules, and the first
-                # one is correct
-                continue
-
-            # Most documentation pages have a label
-            if directive == "std:doc":
-                subdirective = "label"
-
-            if location.endswith("$"):
-                location = location[:-1] + name
-
-            key = name if dispname == "-" else dispname
-            prefix = f"{subdirective}:" if domain == "std" else ""
+        return result
 
-            if projname == "discord.py":
-                key = key.replace("discord.ext.commands.", "").replace("discord.", "")
 
-            result[f"{prefix}{key}"] = path.join(url, location)
+def add_entry(result, projname, url, name, directive, prio, location, dispname):
+    domain, _, subdirective = directive.partition(":")
+    if directive == "py:module" and name in result:
+        # From the Sphinx Repository:
+        # due to a bug in 1.1 and below,
+        # two inventory entries are created
+        # for Python modules, and the first
+        # one is correct
+        return
+
+    # Most documentation pages have a label
+    if directive == "std:doc":
+        subdirective = "label"
+
+    if location.endswith("$"):
+        location = location[:-1] + name
+
+    key = name if dispname == "-" else dispname
+    prefix = f"{subdirective}:" if domain == "std" else ""
+
+    if projname == "discord.py":
+        key = key.replace("discord.ext.commands.", "").replace("discord.", "")
+
+    result[f"{prefix}{key}"] = path.join(url, location)
+
+
+class SphinxObjectFileParser:
+    """An incremental `objects.inv` parser that is fed chunks as they're downloaded.
+
+    Unlike `SphinxObjectFileReader`, it never holds more than a chunk of the file
+    in memory and matches entries directly on the decompressed bytes.
+    """
+
+    BUFSIZE = SphinxObjectFileReader.BUFSIZE
+    WHITESPACE = b" \t\r\n\x0b\x0c"
+    entry_regex = re.compile(rb"(?x)(.+?)\s+(\S*:\S*)\s+(-?\d+)\s+(\S+)\s+(.*)")
+
+    def __init__(self, url):
+        self.url = url
+        self.result = {}
+        self.header = []
+        self.projname = None
+        self.decompressor = decompressobj()
+        self.pending = b""
+
+    def feed(self, chunk):
+        if self.projname is None:
+            chunk = self.feed_header(chunk)
+        # bound the size of the decompressed output to keep memory usage flat
+        while chunk:
+            self.feed_lines(self.decompressor.decompress(chunk, self.BUFSIZE))
+            chunk = self.decompressor.unconsumed_tail
+
+    def feed_header(self, chunk):
+        """Consume the four plaintext header lines, returning the rest of the chunk."""
+        data = self.pending + chunk
+        start = 0
+        while len(self.header) < 4:
+            end = data.find(b"\n", start)
+            if end == -1:
+                self.pending = data[start:]
+                return b""
+            self.header.append(data[start:end].decode("utf-8").rstrip())
+            start = end + 1
+        self.pending = b""
 
-        return result
+        # first line is version info
+        if self.header[0] != "# Sphinx inventory version 2":
+            raise RuntimeError("Invalid objects.inv file version.")
+        # next line says if it's a zlib header
+        if "zlib" not in self.header[3]:
+            raise RuntimeError("Invalid objects.inv file, not z-lib compatible.")
+        # the project name is on the second line as "# Project: <name>"
+        self.projname = self.header[1][11:]
+        return data[start:]
+
+    def feed_lines(self, data):
+        if self.pending:
+            # only the unfinished line is carried over, not the whole buffer
+            data = self.pending + data
+        match_entry = self.entry_regex.match
+        whitespace = self.WHITESPACE
+        start = 0
+        end = data.find(b"\n")
+        while end != -1:
+            stripped = end
+            while stripped > start and data[stripped - 1] in whitespace:
+                stripped -= 1
+            if match := match_entry(data, start, stripped):
+                add_entry(
+                    self.result,
+                    self.projname,
+                    self.url,
+                    *(group.decode("utf-8") for group in match.groups()),
+                )
+            start = end + 1
+            end = data.find(b"\n", start)
+        self.pending = data[start:]
+
+    def close(self):
+        """Flush the decompressor and return the parsed inventory."""
+        if self.projname is None:
+            raise RuntimeError("Invalid objects.inv file, incomplete header.")
+        self.feed_lines(self.decompressor.flush())
+        # like the reader, a trailing line without a newline is ignored
+        self.pending = b""
+        return self.result
+
+    @classmethod
+    def parse(cls, buffer, url):
+        """Parse an entire `objects.inv` file that's already in memory."""
+        parser = cls(url)
+        view = memoryview(buffer)
+        for start in range(0, len(view), cls.BUFSIZE):
+            parser.feed(view[start : start + cls.BUFSIZE])
+        return parser.close()
+
+    @classmethod
+    def parse_file(cls, file_path, url):
+        """Parse an `objects.inv` file on disk, reading it a chunk at a time."""
+        parser = cls(url)
+        with open(file_path, "rb") as file:
+            while chunk := file.read(cls.BUFSIZE):
+                parser.feed(chunk)
+        return parser.close()
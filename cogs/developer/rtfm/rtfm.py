@@ -28,6 +28,10 @@ TARGETS = {
 }
 
 
+# the documentation choice that searches every target at once
+ALL = "all"
+
+
 OVERRIDES = {
     "tensorflow": "https://github.com/mr-ubik/tensorflow-intersphinx/raw/master/tf2_py_objects.inv",
 }
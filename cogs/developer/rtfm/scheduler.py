@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import random
+from dataclasses import dataclass
+from os import getenv
+from time import monotonic, time
+
+__all__ = ("BuildScheduler", "BuildStatus")
+
+log = logging.getLogger(__name__)
+
+
+@dataclass
+class BuildStatus:
+    """The build state of a single RTFM target."""
+
+    state: str = "queued"  # queued, building, retrying, ready or failed
+    attempts: int = 0
+    builds: int = 0
+    last_duration: float | None = None
+    last_success: float | None = None
+    next_run: float | None = None
+    error: str | None = None
+
+
+class BuildScheduler:
+    """Builds RTFM targets with bounded concurrency, retries and periodic refreshes.
+
+    Every target gets a long-running task that builds it, retries failures with
+    exponential backoff and jitter, then sleeps until its next refresh. The
+    defaults can be overridden with the `RTFM_CONCURRENCY`, `RTFM_TIMEOUT`
+    (seconds per request), `RTFM_RETRIES` and `RTFM_REFRESH` (seconds)
+    environment variables.
+    """
+
+    def __init__(
+        self,
+        build,
+        *,
+        concurrency: int | None = None,
+        timeout: float | None = None,
+        retries: int | None = None,
+        refresh: float | None = None,
+        base_delay: float = 2,
+        max_delay: float = 300,
+    ) -> None:
+        self.build = build
+        # explicit values like `retries=0` take precedence over the environment
+        self.concurrency = (
+            concurrency
+            if concurrency is not None
+            else int(getenv("RTFM_CONCURRENCY", 4))
+        )
+        self.timeout = (
+            timeout if timeout is not None else float(getenv("RTFM_TIMEOUT", 30))
+        )
+        self.retries = (
+            retries if retries is not None else int(getenv("RTFM_RETRIES", 5))
+        )
+        self.refresh = (
+            refresh
+            if refresh is not None
+            else float(getenv("RTFM_REFRESH", 6 * 60 * 60))
+        )
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.semaphore = asyncio.Semaphore(self.concurrency)
+        self.status: dict[str, BuildStatus] = {}
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def start(self, targets) -> None:
+        for target in targets:
+            if target not in self.tasks:
+                self.status[target] = BuildStatus()
+                self.tasks[target] = asyncio.create_task(self.run(target))
+
+    def stop(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+
+    def backoff(self, attempt: int) -> float:
+        """Return the delay before the given retry, with jitter applied."""
+        delay = min(self.max_delay, self.base_delay * 2**attempt)
+        return random.uniform(delay / 2, delay)
+
+    async def run(self, target: str) -> None:
+        status = self.status[target]
+        while True:
+            for attempt in range(self.retries + 1):
+                if await self.build_once(target):
+                    delay = self.refresh * random.uniform(0.9, 1.1)
+                    break
+                if attempt < self.retries:
+                    status.state = "retrying"
+                    delay = self.backoff(attempt)
+                    status.next_run = time() + delay
+                    await asyncio.sleep(delay)
+            else:
+                # give up until the next refresh
+                status.state = "failed"
+                delay = self.refresh
+            status.next_run = time() + delay
+            await asyncio.sleep(delay)
+
+    async def build_once(self, target: str) -> bool:
+        """Build a target once, returning whether it succeeded."""
+        status = self.status[target]
+        async with self.semaphore:
+            status.state = "building"
+            status.attempts += 1
+            start = monotonic()
+            try:
+                await self.build(target)
+            except asyncio.CancelledError:
+                raise
+            except Exception as error:
+                status.error = f"{error.__class__.__name__}: {error}"
+                log.warning("Failed to build RTFM target %s: %s", target, status.error)
+                return False
+
+        status.state = "ready"
+        status.builds += 1
+        status.error = None
+        status.last_duration = monotonic() - start
+        status.last_success = time()
+        return True
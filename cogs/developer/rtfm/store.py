@@ -0,0 +1,117 @@
+import json
+import pickle
+from dataclasses import asdict, dataclass
+from hashlib import sha256
+from os import makedirs, path, replace
+
+from .index import SearchIndex
+
+__all__ = ("InventoryEntry", "InventoryStore")
+
+
+@dataclass
+class InventoryEntry:
+    """A downloaded `objects.inv` file and the metadata needed to revalidate it."""
+
+    url: str
+    digest: str
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def conditional_headers(self) -> dict[str, str]:
+        """The headers to send with a conditional request for this inventory."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class InventoryStore:
+    """Keeps RTFM inventories on disk so they survive restarts.
+
+    Every target is stored as three files: the raw `objects.inv` bytes, its
+    pickled search index and a JSON file containing its validators.
+    """
+
+    def __init__(self, directory: str = "data/rtfm") -> None:
+        self.directory = directory
+        self.entries: dict[str, InventoryEntry] = {}
+
+    @staticmethod
+    def hasher():
+        """Return a new hash object used to compute content digests."""
+        return sha256()
+
+    def _path(self, target: str, extension: str) -> str:
+        return path.join(self.directory, f"{target}.{extension}")
+
+    def _write(self, file_path: str, data: bytes) -> None:
+        # write to a temporary file first so a crash can't leave a truncated file behind
+        temporary = f"{file_path}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        replace(temporary, file_path)
+
+    def download_path(self, target: str) -> str:
+        """Return the file a new download of the target's inventory is written to."""
+        makedirs(self.directory, exist_ok=True)
+        return self._path(target, "inv.part")
+
+    def get(self, target: str) -> InventoryEntry | None:
+        return self.entries.get(target)
+
+    def load(self, targets) -> dict[str, InventoryEntry]:
+        """Load the stored entries of the given targets, skipping missing or corrupt ones."""
+        for target in targets:
+            try:
+                with open(self._path(target, "json"), encoding="utf-8") as file:
+                    self.entries[target] = InventoryEntry(**json.load(file))
+            except (OSError, ValueError, TypeError):
+                continue
+        return self.entries
+
+    def raw_path(self, target: str) -> str | None:
+        """Return the path of a target's stored inventory file, if there is one."""
+        file_path = self._path(target, "inv")
+        return file_path if path.exists(file_path) else None
+
+    def read_index(self, target: str) -> SearchIndex | None:
+        try:
+            with open(self._path(target, "index"), "rb") as file:
+                index = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, AttributeError, EOFError, TypeError):
+            # the file is missing or was written by an incompatible version
+            return None
+        if not isinstance(index, SearchIndex):
+            return None
+        # indexes of older versions may be built differently, like their masks
+        return index if getattr(index, "version", None) == SearchIndex.VERSION else None
+
+    def save(
+        self, target: str, download: str, entry: InventoryEntry, index: SearchIndex
+    ) -> None:
+        """Move a downloaded inventory into place and store its index and entry."""
+        makedirs(self.directory, exist_ok=True)
+        replace(download, self._path(target, "inv"))
+        self.save_index(target, index)
+        self.update(target, entry)
+
+    def save_index(self, target: str, index: SearchIndex) -> None:
+        """Store a target's search index without touching its inventory file."""
+        makedirs(self.directory, exist_ok=True)
+        self._write(
+            self._path(target, "index"),
+            pickle.dumps(index, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+
+    def update(self, target: str, entry: InventoryEntry) -> None:
+        """Store a target's entry without touching its raw bytes."""
+        makedirs(self.directory, exist_ok=True)
+        self._write(
+            self._path(target, "json"),
+            json.dumps(asdict(entry), separators=(",", ":")).encode("utf-8"),
+        )
+        self.entries[target] = entry
@@ -0,0 +1,87 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+from os import getenv
+from time import perf_counter
+
+from .index import SearchIndex
+from .parser import SphinxObjectFileParser
+
+__all__ = ("InventoryExecutor", "build_index", "build_index_file")
+
+
+def build_index(raw: bytes, url: str) -> SearchIndex:
+    """Parse and index an entire `objects.inv` file."""
+    return SearchIndex.from_entries(SphinxObjectFileParser.parse(raw, url), url)
+
+
+def build_index_file(file_path: str, url: str) -> SearchIndex:
+    """Parse and index an `objects.inv` file on disk a chunk at a time."""
+    return SearchIndex.from_entries(
+        SphinxObjectFileParser.parse_file(file_path, url), url
+    )
+
+
+def _timed(func, *args):
+    start = perf_counter()
+    result = func(*args)
+    return result, perf_counter() - start
+
+
+class InventoryExecutor:
+    """Runs inventory parsing and indexing away from the event loop.
+
+    The backend is read from the `RTFM_EXECUTOR` environment variable and can be
+    `process` (default), `thread` or `inline`. `RTFM_WORKERS` limits the number
+    of workers. The time spent in the workers is recorded per target.
+    """
+
+    BACKENDS = ("process", "thread", "inline")
+
+    def __init__(self, backend: str | None = None, max_workers: int | None = None):
+        self.backend = backend or getenv("RTFM_EXECUTOR", "process")
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Unknown RTFM executor backend: {self.backend}")
+        if max_workers is None and (workers := getenv("RTFM_WORKERS")):
+            max_workers = int(workers)
+        self.max_workers = max_workers
+        self.executor: Executor | None = None
+        self.timings: dict[str, float] = {}
+
+    @property
+    def inline(self) -> bool:
+        return self.backend == "inline"
+
+    @property
+    def total_time(self) -> float:
+        """The total time spent running jobs in seconds, summed across targets."""
+        return sum(self.timings.values())
+
+    def _get_executor(self) -> Executor:
+        if self.executor is None:
+            if self.backend == "process":
+                # spawn instead of forking the process the event loop is running in
+                self.executor = ProcessPoolExecutor(
+                    self.max_workers, mp_context=get_context("spawn")
+                )
+            else:
+                self.executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="rtfm"
+                )
+        return self.executor
+
+    async def run(self, target: str, func, *args):
+        """Run `func(*args)` on the configured backend for the given target."""
+        if self.inline:
+            result, elapsed = _timed(func, *args)
+        else:
+            result, elapsed = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), _timed, func, *args
+            )
+        self.timings[target] = self.timings.get(target, 0) + elapsed
+        return result
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -5,7 +5,7 @@ from datetime import timedelta
 import discord
 from discord.utils import utcnow
 
-from core import Cog, Context, GuildModel, humanize_time
+from core import Cog, Context, humanize_time
 
 Preset = namedtuple("Preset", ("color", "emoji", "text"))
 PRESETS = {
@@ -114,7 +114,7 @@ class Logs(Cog):
     async def prepare_moderation_log(
         self, action: str, guild: discord.Guild, target: discord.User | discord.Member
     ):
-        if channel := await GuildModel.get_text_channel(guild, "mod_log"):
+        if channel := await self.bot.guild_configs.get_text_channel(guild, "mod_log"):
             await asyncio.sleep(1)
             async for entry in guild.audit_logs(
                 action=getattr(discord.AuditLogAction, action),
@@ -137,7 +137,9 @@ class Logs(Cog):
         after: discord.abc.GuildChannel | discord.Role | None = None,
     ):
         if not (
-            channel := await GuildModel.get_text_channel(before.guild, "server_log")
+            channel := await self.bot.guild_configs.get_text_channel(
+                before.guild, "server_log"
+            )
         ):
             return
 
@@ -208,7 +210,9 @@ class Logs(Cog):
             or not after.timed_out
         ):
             return
-        if channel := await GuildModel.get_text_channel(after.guild, "mod_log"):
+        if channel := await self.bot.guild_configs.get_text_channel(
+            after.guild, "mod_log"
+        ):
             await asyncio.sleep(1)
             async for entry in after.guild.audit_logs(
                 action=discord.AuditLogAction.member_update,
@@ -290,7 +294,7 @@ class Logs(Cog):
     ):
         """Set channels for logs."""
         field = "mod_log" if category == "Moderation" else "server_log"
-        await GuildModel.update_or_create(id=ctx.guild_id, defaults={field: channel.id})
+        await self.bot.guild_configs.update(ctx.guild_id, **{field: channel.id})
         await ctx.respond(f"{category} logs will be sent to {channel.mention}.")
 
     @logs.command(name="disable")
@@ -301,12 +305,7 @@ class Logs(Cog):
     )
     async def logs_disable(self, ctx: Context, category: str):
         field = "mod_log" if category == "Moderation" else "server_log"
-        if (
-            guild := await GuildModel.filter(id=ctx.guild_id)
-            .exclude(**{field: 0})
-            .first()
-        ):
-            await guild.update_from_dict({field: 0}).save()
+        if await self.bot.guild_configs.disable(ctx.guild_id, field):
             return await ctx.respond(
                 f"{category} logs have been disabled for this server."
             )
@@ -1,3 +1,5 @@
+from time import time
+
 from discord.ext.commands import command
 from jishaku.codeblocks import codeblock_converter
 from jishaku.modules import ExtensionConverter
@@ -32,6 +34,74 @@ class Owner(Cog, command_attrs={"hidden": True}):
         await self.jishaku.jsk_git(ctx, argument=codeblock_converter("pull"))
         await self.jishaku.jsk_load(ctx, *to_load)
 
+    @command(aliases=["rtfm"])
+    async def rtfm_status(self, ctx):
+        if not (developer := self.bot.get_cog("Developer")):
+            return await ctx.send("The Developer cog isn't loaded.")
+        scheduler, executor = developer.rtfm_scheduler, developer.rtfm_executor
+        now = time()
+        lines = [
+            f"{'target':<15}{'state':<10}{'builds':>7}{'fails':>6}{'took':>8}{'worker':>8}{'age':>8}"
+        ]
+        for target, status in scheduler.status.items():
+            took = f"{status.last_duration:.2f}s" if status.last_duration else "-"
+            worker = (
+                f"{executor.timings[target]:.2f}s"
+                if target in executor.timings
+                else "-"
+            )
+            age = (
+                f"{(now - status.last_success) / 60:.0f}m"
+                if status.last_success
+                else "-"
+            )
+            lines.append(
+                f"{target:<15}{status.state:<10}{status.builds:>7}"
+                f"{status.attempts - status.builds:>6}{took:>8}{worker:>8}{age:>8}"
+            )
+            if status.error:
+                lines.append(f"  {status.error}"[:120])
+        lines.append(
+            f"\nExecutor: {executor.backend}, {executor.total_time:.2f}s total"
+            f"\nQuery cache: {developer.rtfm_queries.stats}"
+        )
+        table = "\n".join(lines)
+        await ctx.send(f"```\n{table[:1990]}```")
+
+    @command()
+    async def github(self, ctx):
+        github = self.bot.github
+        limit = github.rate_limit
+        reset = f"{(limit.reset - time()) / 60:.0f}m" if limit.reset > time() else "-"
+        stats = "\n".join(f"{key}: {value}" for key, value in github.stats.items())
+        await ctx.send(
+            f"```\n{stats}\nreset: {reset}\n"
+            f"authenticated: {github.token is not None}\ncached etags: {len(github.etags)}```"
+        )
+
+    @command()
+    async def ingress(self, ctx):
+        lines = [
+            f"{'pattern':<10}{'skipped':>9}{'scans':>7}{'matches':>9}{'scan':>9}{'handler':>9}"
+        ]
+        for entry in self.bot.ingress.patterns.values():
+            lines.append(
+                f"{entry.name:<10}{entry.skipped:>9}{entry.scans:>7}{entry.matches:>9}"
+                f"{entry.scan_time * 1000:>7.1f}ms{entry.handler_time * 1000:>7.1f}ms"
+            )
+        table = "\n".join(lines)
+        await ctx.send(f"```\n{table[:1990]}```")
+
+    @command()
+    async def tags(self, ctx):
+        stats = "\n".join(
+            f"{key}: {value}" for key, value in self.bot.tag_contents.stats.items()
+        )
+        await ctx.send(
+            f"```\n{stats}\npending uses: {sum(self.bot.tag_uses.pending.values())}"
+            f"\nindexed guilds: {len(self.bot.tag_names.guilds)}```"
+        )
+
     async def cog_check(self, ctx):
         return ctx.author.id in self.bot.owner_ids
 
@@ -32,6 +32,16 @@ class Pycord(Cog):
         self.staff_list = None
         self.staff_list_channel = None
         self.chunked = False
+        bot.ingress.register(
+            "pastebin",
+            PASTEBIN_RE,
+            needles=("pastebin.com",),
+            handler=self.link_raw_pastes,
+            guild_ids=[881207955029110855],
+        )
+
+    def cog_unload(self) -> None:
+        self.bot.ingress.unregister("pastebin")
 
     async def convert_attr(self, path):
         thing = discord
@@ -67,11 +77,9 @@ class Pycord(Cog):
     async def update_example_cache(self):
         """Updates the cached example list with the latest contents from the repo."""
         file_url = "https://api.github.com/repos/Pycord-Development/pycord/git/trees/master?recursive=1"
-        async with self.bot.http_session.get(
-            file_url, raise_for_status=True
-        ) as response:
-            self.bot.cache["example_list"] = examples = await response.json()
-            return examples
+        response = await self.bot.github.fetch(file_url)
+        self.bot.cache["example_list"] = examples = response.json()
+        return examples
 
     async def get_example_list(self, ctx: discord.AutocompleteContext):
         """Gets the latest list of example files found in the Pycord repository."""
@@ -202,16 +210,11 @@ class Pycord(Cog):
         await ctx.author.add_roles(discord.Object(role))
         await ctx.respond(f"You have received the <@&{role}> role.")
 
-    @Cog.listener()
-    async def on_message(self, message: discord.Message):
-        if message.guild is not None and message.guild.id == 881207955029110855:
-            messages = []
-            matches = re.findall(PASTEBIN_RE, message.content)
-            for match in matches:
-                base_url, paste_id = match
-                messages.append(f"{base_url}/raw/{paste_id}")
-            if messages:
-                await message.channel.send("\n".join(messages))
+    async def link_raw_pastes(self, message: discord.Message, matches) -> None:
+        """Send the raw versions of the pastebin links in a message."""
+        await message.channel.send(
+            "\n".join(f"{match[1]}/raw/{match[2]}" for match in matches)
+        )
 
 
 def setup(bot):
@@ -3,7 +3,7 @@ from discord.utils import get
 from aiohttp import InvalidURL
 from io import BytesIO
 
-from core import Cog, Context, GuildModel
+from core import Cog, Context
 
 
 class Server(Cog):
@@ -70,20 +70,13 @@ class Server(Cog):
     )
     async def suggestions_set(self, ctx: Context, channel: discord.TextChannel):
         """Set the channel for member suggestions."""
-        await GuildModel.update_or_create(
-            id=ctx.guild_id, defaults={"suggestions": channel.id}
-        )
+        await self.bot.guild_configs.update(ctx.guild_id, suggestions=channel.id)
         await ctx.respond(f"Member suggestions will now be sent to {channel.mention}.")
 
     @suggestions.command(name="disable")
     async def suggestions_disable(self, ctx: Context):
         """Disable member suggestions."""
-        if (
-            guild := await GuildModel.filter(id=ctx.guild_id)
-            .exclude(suggestions=0)
-            .first()
-        ):
-            await guild.update_from_dict({"suggestions": 0}).save()
+        if await self.bot.guild_configs.disable(ctx.guild_id, "suggestions"):
             return await ctx.respond(
                 "Member suggestions have been disabled for this server."
             )
@@ -95,7 +88,11 @@ class Server(Cog):
         """Make a suggestion for the server. This will be sent to the channel set by the server managers."""
         await ctx.assert_permissions(external_emojis=True)
         assert ctx.guild
-        if not (channel := await GuildModel.get_text_channel(ctx.guild, "suggestions")):
+        if not (
+            channel := await self.bot.guild_configs.get_text_channel(
+                ctx.guild, "suggestions"
+            )
+        ):
             return await ctx.respond("This server doesn't have a suggestions channel.")
 
         msg = await channel.send(
@@ -17,11 +17,8 @@ class Tags(Cog):
 
     async def get_tag_names(self, ctx: discord.AutocompleteContext) -> List[str]:
         assert ctx.interaction.guild_id
-        return [
-            tag.name
-            for tag in await TagModel.filter(guild_id=ctx.interaction.guild_id)
-            if ctx.value in tag.name
-        ]
+        names = await self.bot.tag_names.get(ctx.interaction.guild_id)
+        return names.search(ctx.value, limit=25)
 
     @tag.command()
     @discord.option(
@@ -31,9 +28,10 @@ class Tags(Cog):
     )
     async def view(self, ctx: Context, *, name: Lowercase):
         """View a tag's content."""
-        if tag := await TagModel.get_or_none(name=name, guild_id=ctx.guild_id):
-            await ctx.respond(tag.content)
-            await tag.update_from_dict({"uses": tag.uses + 1}).save()
+        assert ctx.guild_id
+        if (content := await self.bot.tag_contents.get(ctx.guild_id, name)) is not None:
+            await ctx.respond(content)
+            self.bot.tag_uses.add(ctx.guild_id, name)
         else:
             await ctx.respond("A tag with this name doesn't exist.")
 
@@ -52,6 +50,7 @@ class Tags(Cog):
                 guild_id=ctx.guild_id,
                 uses=0,
             )
+            self.bot.tag_names.add(ctx.guild_id, name)
             await ctx.respond(f"Tag `{name}` created successfully.")
 
     @tag.command()
@@ -68,6 +67,7 @@ class Tags(Cog):
                 or ctx.channel.permissions_for(ctx.author).manage_messages
             ):
                 await tag.update_from_dict({"content": content}).save()
+                self.bot.tag_contents.invalidate(tag.guild_id, name)
                 await ctx.respond(f"Tag `{name}` edited successfully.")
             else:
                 await ctx.respond("You don't own this tag.")
@@ -90,6 +90,9 @@ class Tags(Cog):
                 or ctx.channel.permissions_for(ctx.author).manage_messages
             ):
                 await tag.delete()
+                self.bot.tag_uses.discard(tag.guild_id, name)
+                self.bot.tag_names.remove(tag.guild_id, name)
+                self.bot.tag_contents.invalidate(tag.guild_id, name)
                 await ctx.respond(f"Tag `{name}` deleted successfully.")
             else:
                 await ctx.respond("You don't own this tag.")
@@ -106,6 +109,7 @@ class Tags(Cog):
         if tag := await TagModel.get_or_none(name=name, guild_id=ctx.guild_id):
             if tag.author_id == ctx.author.id:
                 await tag.update_from_dict({"author_id": member.id}).save()
+                self.bot.tag_contents.invalidate(tag.guild_id, name)
                 await ctx.respond(f"Tag `{name}` transferred to {member} successfully.")
             else:
                 await ctx.respond("You don't own this tag.")
@@ -123,6 +127,9 @@ class Tags(Cog):
                     await ctx.respond("A tag with this name already exists.")
                 else:
                     await tag.update_from_dict({"name": new_name}).save()
+                    self.bot.tag_uses.rename(tag.guild_id, name, new_name)
+                    self.bot.tag_names.rename(tag.guild_id, name, new_name)
+                    self.bot.tag_contents.invalidate(tag.guild_id, name)
                     await ctx.respond(
                         f"Tag `{name}` renamed to `{new_name}` successfully."
                     )
@@ -144,7 +151,10 @@ class Tags(Cog):
             await ctx.respond(
                 embed=discord.Embed(title=tag.name, color=discord.Color.blurple())
                 .add_field(name="Owner", value=owner.mention)
-                .add_field(name="Uses", value=tag.uses)  # type: ignore # IntField returns an int
+                .add_field(
+                    name="Uses",
+                    value=tag.uses + self.bot.tag_uses.get(tag.guild_id, tag.name),  # type: ignore # IntField returns an int
+                )
                 .add_field(name="Created At", value=format_dt(tag.created_at))
             )
         else:
@@ -156,8 +166,9 @@ class Tags(Cog):
     )
     async def raw(self, ctx: Context, *, name: Lowercase):
         """View the content of a tag, with escaped markdown."""
-        if tag := await TagModel.get_or_none(name=name, guild_id=ctx.guild_id):
-            await ctx.respond(escape_markdown(tag.content))
+        assert ctx.guild_id
+        if (content := await self.bot.tag_contents.get(ctx.guild_id, name)) is not None:
+            await ctx.respond(escape_markdown(content))
         else:
             await ctx.respond("A tag with this name doesn't exist.")
 
@@ -171,6 +182,7 @@ class Tags(Cog):
                 await ctx.respond("The author of this tag is still in the server.")
             else:
                 await tag.update_from_dict({"author_id": ctx.author.id}).save()
+                self.bot.tag_contents.invalidate(tag.guild_id, name)
                 await ctx.respond("Successfully claimed tag.")
         else:
             await ctx.respond("A tag with this name doesn't exist.")
@@ -179,15 +191,12 @@ class Tags(Cog):
     @discord.option("query", description="The query to use while searching tags.")
     async def search(self, ctx: Context, *, query: str):
         """Search the guild's tags."""
-        if tags := await TagModel.filter(guild_id=ctx.guild_id):
+        if names := await self.bot.tag_names.get(ctx.guild_id):
             await ctx.respond(
                 embed=discord.Embed(
                     title=f"Tag Search | {query}",
                     description="\n".join(
-                        f"{i+1}. {name}"
-                        for i, name in enumerate(
-                            tag.name for tag in tags if query in tag.name
-                        )
+                        f"{i+1}. {name}" for i, name in enumerate(names.search(query))
                     ),
                     color=discord.Color.blurple(),
                 )
@@ -206,26 +215,26 @@ class Tags(Cog):
         """List the tags of a member or all tags created in this server."""
         assert ctx.guild
         if member:
-            if tags := await TagModel.filter(
+            if names := await TagModel.filter(
                 guild_id=ctx.guild_id, author_id=member.id
-            ):
+            ).values_list("name", flat=True):
                 await ctx.respond(
                     embed=discord.Embed(
                         title=f"{member.display_name}'{s(member.display_name)} Tags",
                         description="\n".join(
-                            f"{i+1}. {tag.name}" for i, tag in enumerate(tags)
+                            f"{i+1}. {name}" for i, name in enumerate(names)
                         ),
                         color=discord.Color.blurple(),
                     )
                 )
             else:
                 await ctx.respond("This member does not have any tags in this server.")
-        elif tags := await TagModel.filter(guild_id=ctx.guild_id):
+        elif names := await self.bot.tag_names.get(ctx.guild_id):
             await ctx.respond(
                 embed=discord.Embed(
                     title=f"Tags in {ctx.guild.name}",
                     description="\n".join(
-                        f"{i+1}. {tag.name}" for i, tag in enumerate(tags)
+                        f"{i+1}. {name}" for i, name in enumerate(names.names)
                     ),
                     color=discord.Color.blurple(),
                 )
@@ -1,7 +1,7 @@
 import discord
 from discord.utils import utcnow
 
-from core import Cog, Context, GuildModel, WarnModel
+from core import Cog, Context, WarnModel
 
 
 async def warn(
@@ -52,9 +52,10 @@ class WarnModal(discord.ui.Modal):
         assert interaction.guild
         await warn(interaction, self.member, reason=self.children[0].value)
         if (
-            channel := await GuildModel.get_text_channel(interaction.guild, "mod_log")
-            and self.logs
-        ):
+            channel := await interaction.client.guild_configs.get_text_channel(  # type: ignore # the client is a Bond
+                interaction.guild, "mod_log"
+            )
+        ) and self.logs:
             await self.logs.log_moderation_action(  # type: ignore # cog must be the logs cog
                 "warning",
                 self.member,
@@ -1,19 +1,32 @@
 from discord.ext import commands
 
 from .bot import Bond
+from .config import GuildConfigCache
 from .context import Context
-from .models import GuildModel, TagModel, WarnModel
-from .utils import Lowercase, humanize_time, s, list_items
+from .github import GitHubClient, GitHubRateLimited
+from .ingress import MessageIngress
+from .models import GuildModel, GuildPurgeModel, TagModel, WarnModel
+from .tags import TagContentCache, TagNameIndex, TagUsageBuffer
+from .utils import Lowercase, SingleFlight, humanize_time, s, list_items
 
 __all__ = (
     "Bond",
     "Cog",
     "Context",
+    "GitHubClient",
+    "GitHubRateLimited",
+    "GuildConfigCache",
     "GuildModel",
+    "GuildPurgeModel",
     "Lowercase",
+    "MessageIngress",
     "s",
+    "SingleFlight",
     "list_items",
+    "TagContentCache",
     "TagModel",
+    "TagNameIndex",
+    "TagUsageBuffer",
     "WarnModel",
     "humanize_time",
 )
@@ -6,8 +6,14 @@ from aiohttp import ClientSession
 from discord.ext import commands
 from tortoise import Tortoise
 
+from .config import GuildConfigCache
+from .database import database_config, database_report
 from .context import Context
-from .models import GuildModel, TagModel, WarnModel
+from .github import GitHubClient
+from .ingress import MessageIngress
+from .migrations import migrate
+from .purge import GuildPurger
+from .tags import TagContentCache, TagNameIndex, TagUsageBuffer
 
 
 class Bond(commands.Bot):
@@ -27,21 +33,37 @@ class Bond(commands.Bot):
             owner_ids=[543397958197182464],
         )
         self.cache: dict[str, dict] = {"example_list": {}}
+        self.github = GitHubClient(self)
+        self.guild_configs = GuildConfigCache()
+        self.ingress = MessageIngress()
+        self.purger = GuildPurger(self)
+        self.tag_uses = TagUsageBuffer()
+        self.tag_names = TagNameIndex()
+        self.tag_contents = TagContentCache()
 
     async def setup_tortoise(self) -> None:
         makedirs("data", exist_ok=True)
-        await Tortoise.init(
-            db_url="sqlite://data/database.db", modules={"models": ["core.models"]}
-        )
-        await Tortoise.generate_schemas()
+        config, profile = database_config()
+        await Tortoise.init(config=config)
+        print(await database_report(profile))
+        for migration in await migrate():
+            print(f"Applied migration {migration.version}: {migration.description}")
 
     async def start(self, token: str, *, reconnect: bool = True) -> None:
         await self.setup_tortoise()
+        self.purger.start()
+        self.tag_uses.start()
         return await super().start(token, reconnect=reconnect)
 
     async def close(self) -> None:
-        await Tortoise.close_connections()
-        return await super().close()
+        try:
+            self.purger.stop()
+            await self.tag_uses.close()
+        finally:
+            try:
+                await Tortoise.close_connections()
+            finally:
+                await super().close()
 
     async def get_application_context(
         self, interaction: discord.Interaction
@@ -62,6 +84,7 @@ class Bond(commands.Bot):
             if (webhook_url := getenv("ERRORS_WEBHOOK"))
             else None
         )
+        await self.guild_configs.warm(guild.id for guild in self.guilds)
         print(self.user, "is ready")
 
     async def on_application_command_error(self, ctx: Context, error: Exception):
@@ -103,19 +126,24 @@ class Bond(commands.Bot):
             )
         )
 
+    async def on_message(self, message: discord.Message) -> None:
+        await self.process_commands(message)
+        await self.ingress.process(message)
+
     async def on_message_edit(
         self, before: discord.Message, after: discord.Message
     ) -> None:
         if before.content != after.content:
             await self.process_commands(after)
 
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        await self.purger.cancel(guild.id)
+
     async def on_guild_remove(self, guild: discord.Guild) -> None:
-        if data := await GuildModel.get_or_none(id=guild.id):
-            await data.delete()
-        for data in await TagModel.filter(id=guild.id):
-            await data.delete()
-        for data in await WarnModel.filter(id=guild.id):
-            await data.delete()
+        self.guild_configs.discard(guild.id)
+        self.tag_names.discard(guild.id)
+        self.tag_contents.discard(guild.id)
+        await self.purger.schedule(guild.id)
 
     def run(
         self, debug: bool = False, cogs: list[str] | None = None, sync: bool = False
@@ -0,0 +1,62 @@
+from discord import Guild, TextChannel
+
+from .models import GuildModel
+
+__all__ = ("GuildConfigCache",)
+
+
+class GuildConfigCache:
+    """Keeps the configuration of guilds in memory.
+
+    Guilds without a configuration are cached as `None`, so they don't need a
+    query either. The cache is filled for every guild at once by `warm` and
+    changes have to go through `update` or `disable` to keep it current.
+    """
+
+    # stays below SQLite's default limit of 999 variables per query
+    BATCH_SIZE = 900
+
+    def __init__(self) -> None:
+        self.configs: dict[int, GuildModel | None] = {}
+
+    async def warm(self, guild_ids) -> None:
+        """Load the configuration of the given guilds with as few queries as possible."""
+        guild_ids = list(guild_ids)
+        for i in range(0, len(guild_ids), self.BATCH_SIZE):
+            batch = guild_ids[i : i + self.BATCH_SIZE]
+            configs = {
+                config.id: config for config in await GuildModel.filter(id__in=batch)
+            }
+            for guild_id in batch:
+                self.configs[guild_id] = configs.get(guild_id)
+
+    async def get(self, guild_id: int) -> GuildModel | None:
+        if guild_id not in self.configs:
+            self.configs[guild_id] = await GuildModel.get_or_none(id=guild_id)
+        return self.configs[guild_id]
+
+    async def get_text_channel(
+        self, guild: Guild, field_name: str
+    ) -> TextChannel | None:
+        """Return the text channel from a guild set to the given field."""
+        if (config := await self.get(guild.id)) and (
+            channel_id := getattr(config, field_name)
+        ):
+            channel = guild.get_channel(channel_id)
+            return channel if isinstance(channel, TextChannel) else None
+
+    async def update(self, guild_id: int, **fields) -> GuildModel:
+        """Update the configuration of a guild, creating it if it doesn't exist."""
+        config, _ = await GuildModel.update_or_create(id=guild_id, defaults=fields)
+        self.configs[guild_id] = config
+        return config
+
+    async def disable(self, guild_id: int, field_name: str) -> bool:
+        """Unset a channel of a guild, returning whether it was set."""
+        if (config := await self.get(guild_id)) and getattr(config, field_name):
+            await self.update(guild_id, **{field_name: 0})
+            return True
+        return False
+
+    def discard(self, guild_id: int) -> None:
+        self.configs.pop(guild_id, None)
@@ -0,0 +1,73 @@
+from os import getenv, makedirs, path
+from urllib.parse import parse_qs, urlsplit
+
+from tortoise import Tortoise
+from tortoise.backends.base.config_generator import generate_config
+
+__all__ = ("SQLITE_PROFILES", "database_config", "database_report")
+
+# pragmas applied to every SQLite connection, parameters in the URL take precedence
+SQLITE_PROFILES: dict[str, dict[str, str | int]] = {
+    "performance": {
+        "journal_mode": "WAL",
+        # durable at checkpoints, a power loss can only lose the last transactions
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 2**20,
+        "cache_size": -64 * 2**10,  # negative values are in KiB
+        "busy_timeout": 5000,
+        "temp_store": "MEMORY",
+    },
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+    },
+    # SQLite's own defaults
+    "default": {"journal_mode": "DELETE"},
+}
+
+
+def database_config() -> tuple[dict, str]:
+    """Return the Tortoise config and the name of the profile in use.
+
+    The database is read from `DATABASE_URL` and defaults to SQLite at
+    `data/database.db`. SQLite connections get the pragmas of `SQLITE_PROFILE`
+    (`performance` by default) and Postgres pools are sized by `DB_POOL_MIN` and
+    `DB_POOL_MAX`.
+    """
+    url = getenv("DATABASE_URL", "sqlite://data/database.db")
+    config = generate_config(url, app_modules={"models": ["core.models"]})
+    connection = config["connections"]["default"]
+    credentials = connection["credentials"]
+    explicit = parse_qs(urlsplit(url).query)
+
+    if connection["engine"] == "tortoise.backends.sqlite":
+        profile = getenv("SQLITE_PROFILE", "performance")
+        for pragma, value in SQLITE_PROFILES[profile].items():
+            if pragma not in explicit:
+                credentials[pragma] = value
+        file_path = credentials["file_path"]
+        if file_path != ":memory:" and (directory := path.dirname(file_path)):
+            makedirs(directory, exist_ok=True)
+    else:
+        profile = "pool"
+        for key, variable in (("minsize", "DB_POOL_MIN"), ("maxsize", "DB_POOL_MAX")):
+            if key not in explicit and (value := getenv(variable)):
+                credentials[key] = int(value)
+    return config, profile
+
+
+async def database_report(profile: str) -> str:
+    """Describe the active database connection and its settings."""
+    connection = Tortoise.get_connection("default")
+    dialect = connection.capabilities.dialect
+    if dialect != "sqlite":
+        pool = getattr(connection, "_pool", None)
+        size = f", {pool.get_size()} connections" if pool else ""
+        return f"Database: {dialect} ({profile} profile{size})"
+
+    settings = []
+    for pragma in SQLITE_PROFILES["performance"]:
+        rows = await connection.execute_query_dict(f"PRAGMA {pragma}")
+        settings.append(f"{pragma}={[*rows[0].values()][0] if rows else '-'}")
+    return f"Database: sqlite ({profile} profile, {' '.join(settings)})"
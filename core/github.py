@@ -0,0 +1,235 @@
+import asyncio
+import json
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from functools import cached_property
+from os import getenv
+from time import time
+from typing import Any, AsyncIterator
+
+from aiohttp import ClientResponse, ClientSession
+from yarl import URL
+
+from .utils import SingleFlight
+
+__all__ = ("GitHubClient", "GitHubRateLimited", "GitHubResponse", "RateLimit")
+
+API_HOST = "api.github.com"
+
+
+class GitHubRateLimited(Exception):
+    """Raised instead of making a request that would exceed GitHub's rate limit."""
+
+    def __init__(self, retry_after: float) -> None:
+        self.retry_after = retry_after
+        super().__init__(
+            "GitHub's rate limit has been reached, "
+            f"try again in {max(1, round(retry_after))} seconds."
+        )
+
+
+@dataclass
+class RateLimit:
+    """The rate limit budget GitHub reported with the last response."""
+
+    limit: int | None = None
+    remaining: int | None = None
+    reset: float = 0
+    # set when GitHub asks to back off with a `Retry-After` header
+    blocked_until: float = 0
+
+
+@dataclass
+class GitHubResponse:
+    status: int
+    body: bytes
+    links: dict[str, str] = field(default_factory=dict)
+
+    @cached_property
+    def data(self) -> Any:
+        """The decoded JSON body, shared by everyone the response is returned to."""
+        return json.loads(self.body)
+
+    def json(self) -> Any:
+        return self.data
+
+
+class GitHubClient:
+    """Makes requests to the GitHub API within its rate limit.
+
+    Requests to the API are authenticated with `GITHUB_TOKEN` if it's set, other
+    hosts such as the one serving raw gist files never get the token and aren't
+    limited. The remaining budget is tracked from the rate limit headers of every
+    API response; once it drops to `GITHUB_RESERVE` (0 by default), requests wait
+    for the reset if it's at most `GITHUB_MAX_WAIT` seconds (10 by default) away
+    and raise `GitHubRateLimited` otherwise.
+
+    `fetch` remembers the ETags of responses so repeated requests are
+    conditional, and 304 responses don't use up the budget. Concurrent fetches
+    of the same resource share a single request.
+    """
+
+    def __init__(
+        self,
+        bot,
+        *,
+        token: str | None = None,
+        reserve: int | None = None,
+        max_wait: float | None = None,
+        max_etags: int = 256,
+    ) -> None:
+        self.bot = bot
+        self.token = token or getenv("GITHUB_TOKEN")
+        self.reserve = (
+            reserve if reserve is not None else int(getenv("GITHUB_RESERVE", 0))
+        )
+        self.max_wait = (
+            max_wait if max_wait is not None else float(getenv("GITHUB_MAX_WAIT", 10))
+        )
+        self.max_etags = max_etags
+        # GitHub keeps separate budgets for the REST and GraphQL APIs
+        self.rate_limits: dict[str, RateLimit] = {}
+        self.etags: OrderedDict[tuple[str, str], tuple[str, GitHubResponse]] = (
+            OrderedDict()
+        )
+        self.requests = 0
+        self.not_modified = 0
+        self.waited = 0
+        self.shed = 0
+        self.flights = SingleFlight()
+
+    @property
+    def session(self) -> ClientSession:
+        return self.bot.http_session
+
+    @property
+    def rate_limit(self) -> RateLimit:
+        """The budget of the REST API."""
+        return self.rate_limits.setdefault("core", RateLimit())
+
+    @property
+    def stats(self) -> dict[str, int | None]:
+        return {
+            "remaining": self.rate_limit.remaining,
+            "limit": self.rate_limit.limit,
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "waited": self.waited,
+            "shed": self.shed,
+            "coalesced": self.flights.coalesced,
+        }
+
+    async def _acquire(self, resource: str) -> None:
+        """Waits until the budget allows another request, or raises if that's too long."""
+        limit = self.rate_limits.setdefault(resource, RateLimit())
+        while True:
+            now = time()
+            if limit.blocked_until > now:
+                delay = limit.blocked_until - now
+            elif (
+                limit.remaining is not None
+                and limit.remaining <= self.reserve
+                and limit.reset > now
+            ):
+                delay = limit.reset - now
+            else:
+                if limit.remaining is not None:
+                    # count requests in flight before their responses update it
+                    limit.remaining -= 1
+                return
+            if delay > self.max_wait:
+                self.shed += 1
+                raise GitHubRateLimited(delay)
+            self.waited += 1
+            await asyncio.sleep(delay)
+
+    def _update(self, response: ClientResponse, resource: str) -> RateLimit:
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        limit = self.rate_limits.setdefault(resource, RateLimit())
+        if (remaining := headers.get("X-RateLimit-Remaining")) is not None:
+            limit.remaining = int(remaining)
+            limit.limit = int(headers.get("X-RateLimit-Limit", limit.limit or 0))
+            limit.reset = float(headers.get("X-RateLimit-Reset", limit.reset))
+        if (retry_after := headers.get("Retry-After")) is not None:
+            limit.blocked_until = time() + float(retry_after)
+        elif response.status in (403, 429) and limit.remaining == 0:
+            limit.blocked_until = limit.reset
+        return limit
+
+    @asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str] | None = None,
+        *,
+        resource: str = "core",
+        **kwargs,
+    ) -> AsyncIterator[ClientResponse]:
+        """Makes a request to GitHub, raising for error statuses."""
+        headers = {"X-GitHub-Api-Version": "2022-11-28", **(headers or {})}
+        # other hosts, like the one serving raw gist files, don't use the API budget
+        if api := URL(url).host == API_HOST:
+            await self._acquire(resource)
+            if self.token:
+                headers["Authorization"] = f"Bearer {self.token}"
+        self.requests += 1
+        async with self.session.request(
+            method, url, headers=headers, **kwargs
+        ) as response:
+            limit = self._update(response, resource) if api else RateLimit()
+            if response.status == 304:
+                self.not_modified += 1
+            elif response.status in (403, 429) and limit.blocked_until > time():
+                raise GitHubRateLimited(limit.blocked_until - time())
+            response.raise_for_status()
+            yield response
+
+    def get(self, url: str, headers: dict[str, str] | None = None):
+        """Makes a GET request to GitHub, raising for error statuses."""
+        return self.request("GET", url, headers)
+
+    async def graphql(self, query: str, variables: dict[str, Any]) -> dict[str, Any]:
+        """Runs a GraphQL query, which needs a token, and returns its data.
+
+        Missing nodes are returned as null rather than raising.
+        """
+        async with self.request(
+            "POST",
+            "https://api.github.com/graphql",
+            json={"query": query, "variables": variables},
+            resource="graphql",
+        ) as response:
+            result = await response.json()
+        if result.get("data") is None:
+            raise ValueError(result.get("errors", "GitHub returned no data"))
+        return result["data"]
+
+    async def fetch(
+        self, url: str, accept: str = "application/vnd.github.v3+json"
+    ) -> GitHubResponse:
+        """Fetches a resource, revalidating it with its ETag if it was fetched before."""
+        return await self.flights.run(("GET", url, accept), self._fetch, url, accept)
+
+    async def _fetch(self, url: str, accept: str) -> GitHubResponse:
+        key = url, accept
+        headers = {"Accept": accept}
+        if cached := self.etags.get(key):
+            headers["If-None-Match"] = cached[0]
+        async with self.get(url, headers) as response:
+            if response.status == 304 and cached:
+                self.etags.move_to_end(key)
+                return cached[1]
+            result = GitHubResponse(
+                response.status,
+                await response.read(),
+                {rel: str(link["url"]) for rel, link in response.links.items()},
+            )
+            if etag := response.headers.get("ETag"):
+                self.etags[key] = etag, result
+                self.etags.move_to_end(key)
+                while len(self.etags) > self.max_etags:
+                    self.etags.popitem(last=False)
+            return result
@@ -0,0 +1,108 @@
+import re
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Awaitable, Callable
+
+import discord
+
+__all__ = ("MessageIngress", "MessagePattern")
+
+Handler = Callable[[discord.Message, list[re.Match[str]]], Awaitable[None]]
+
+
+@dataclass
+class MessagePattern:
+    """A pattern messages are scanned for, with the literals its matches contain.
+
+    Patterns with a handler are run on every new message, others are only used
+    by `MessageIngress.scan`.
+    """
+
+    name: str
+    pattern: re.Pattern[str]
+    needles: tuple[str, ...]
+    handler: Handler | None = None
+    guild_ids: frozenset[int] | None = None
+    scans: int = 0
+    skipped: int = 0
+    matches: int = 0
+    scan_time: float = 0
+    handler_time: float = 0
+    errors: int = 0
+
+    def accepts(self, content: str) -> bool:
+        """Whether the content contains a literal a match would need."""
+        return any(needle in content for needle in self.needles)
+
+
+class MessageIngress:
+    """Scans messages for the patterns cogs have registered.
+
+    Content is cut to `max_length` characters and checked for the literals of
+    every pattern (such as hostnames) before any regular expression runs, so
+    most messages are rejected with a few substring searches.
+    """
+
+    def __init__(self, max_length: int = 4000) -> None:
+        self.max_length = max_length
+        self.patterns: dict[str, MessagePattern] = {}
+
+    def register(
+        self,
+        name: str,
+        pattern: re.Pattern[str],
+        *,
+        needles: tuple[str, ...],
+        handler: Handler | None = None,
+        guild_ids=None,
+    ) -> None:
+        self.patterns[name] = MessagePattern(
+            name,
+            pattern,
+            needles,
+            handler,
+            frozenset(guild_ids) if guild_ids is not None else None,
+        )
+
+    def unregister(self, *names: str) -> None:
+        for name in names:
+            self.patterns.pop(name, None)
+
+    def _scan(self, entry: MessagePattern, content: str) -> list[re.Match[str]]:
+        if not entry.accepts(content):
+            entry.skipped += 1
+            return []
+        start = perf_counter()
+        matches = list(entry.pattern.finditer(content))
+        entry.scan_time += perf_counter() - start
+        entry.scans += 1
+        entry.matches += len(matches)
+        return matches
+
+    def scan(self, name: str, content: str) -> list[re.Match[str]]:
+        """Return the matches of a registered pattern in the content."""
+        return self._scan(self.patterns[name], content[: self.max_length])
+
+    async def process(self, message: discord.Message) -> None:
+        """Run the handlers of the patterns found in a new message.
+
+        A failing handler doesn't stop the others, its error is raised at the end.
+        """
+        content = message.content[: self.max_length]
+        guild_id = message.guild and message.guild.id
+        error = None
+        for entry in [*self.patterns.values()]:
+            if entry.handler is None or (
+                entry.guild_ids is not None and guild_id not in entry.guild_ids
+            ):
+                continue
+            if matches := self._scan(entry, content):
+                start = perf_counter()
+                try:
+                    await entry.handler(message, matches)
+                except Exception as exception:
+                    entry.errors += 1
+                    error = error or exception
+                entry.handler_time += perf_counter() - start
+        if error:
+            raise error
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from os import path
+
+from tortoise import Tortoise
+from tortoise.transactions import in_transaction
+
+__all__ = ("MIGRATIONS", "Migration", "migrate")
+
+
+@dataclass(frozen=True)
+class Migration:
+    """A versioned change to the schema of databases created before it."""
+
+    version: int
+    description: str
+    statements: tuple[str, ...]
+
+
+# Databases created from scratch already match the models, so these only run on
+# databases that existed before the migration was added. Append new migrations
+# with the next version and never edit the applied ones.
+MIGRATIONS = (
+    Migration(
+        1,
+        "Make tag names unique per guild",
+        (
+            # keep the oldest of duplicate tags, lookups by name fail on duplicates
+            'DELETE FROM "tags" WHERE "id" NOT IN '
+            '(SELECT MIN("id") FROM "tags" GROUP BY "guild_id", "name")',
+            # named like the constraint of new databases, although SQLite names
+            # the index of that constraint "sqlite_autoindex_tags_1" instead
+            'CREATE UNIQUE INDEX IF NOT EXISTS "uid_tags_guild_i_682ddd" '
+            'ON "tags" ("guild_id", "name")',
+        ),
+    ),
+    Migration(
+        2,
+        "Index warnings by guild and target",
+        (
+            # the name Tortoise gives this index, so it's only created once
+            'CREATE INDEX IF NOT EXISTS "idx_warns_guild_i_95ff3a" '
+            'ON "warns" ("guild_id", "target_id")',
+        ),
+    ),
+)
+
+
+async def _tables(connection) -> set[str]:
+    if connection.capabilities.dialect == "sqlite":
+        query = "SELECT name FROM sqlite_master WHERE type = 'table'"
+    else:
+        query = "SELECT tablename AS name FROM pg_tables WHERE schemaname = current_schema()"
+    return {row["name"] for row in await connection.execute_query_dict(query)}
+
+
+async def _backup(connection, version: int) -> str | None:
+    """Copy an SQLite database before it's migrated from the given version."""
+    filename = getattr(connection, "filename", ":memory:")
+    if connection.capabilities.dialect != "sqlite" or filename == ":memory:":
+        return None
+    backup = f"{filename}.v{version}.bak"
+    if not path.exists(backup):
+        await connection.execute_script(f"VACUUM INTO '{backup}'")
+    return backup
+
+
+async def migrate(connection_name: str = "default") -> list[Migration]:
+    """Create missing tables and apply pending migrations, returning the applied ones.
+
+    Every migration runs in its own transaction together with the update of the
+    schema version, and SQLite databases are backed up before migrating.
+    """
+    connection = Tortoise.get_connection(connection_name)
+    tables = await _tables(connection)
+    # a database without the models' tables is new and gets the latest schema
+    fresh = "tags" not in tables
+    await Tortoise.generate_schemas()
+    await connection.execute_script(
+        'CREATE TABLE IF NOT EXISTS "schema_migrations" ('
+        '"version" INT NOT NULL PRIMARY KEY, '
+        '"description" TEXT NOT NULL, '
+        '"applied_at" TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)'
+    )
+    rows = await connection.execute_query_dict(
+        'SELECT MAX("version") AS version FROM "schema_migrations"'
+    )
+    current = rows[0]["version"] or 0
+
+    pending = [migration for migration in MIGRATIONS if migration.version > current]
+    if pending and not fresh:
+        await _backup(connection, current)
+    for migration in pending:
+        async with in_transaction(connection_name) as transaction:
+            if not fresh:
+                for statement in migration.statements:
+                    await transaction.execute_query(statement)
+            description = migration.description.replace("'", "''")
+            await transaction.execute_query(
+                'INSERT INTO "schema_migrations" ("version", "description") '
+                f"VALUES ({migration.version}, '{description}')"
+            )
+    return [] if fresh else pending
@@ -1,27 +1,16 @@
-from discord import Guild, TextChannel
 from tortoise import fields
 from tortoise.models import Model
 
-__all__ = ("GuildModel", "TagModel", "WarnModel")
+__all__ = ("GuildModel", "GuildPurgeModel", "TagModel", "WarnModel")
 
 
 class GuildModel(Model):
-    id = fields.IntField(pk=True)
-    mod_log = fields.IntField(default=0)
-    server_log = fields.IntField(default=0)
-    suggestions = fields.IntField(default=0)
+    id = fields.BigIntField(pk=True)
+    mod_log = fields.BigIntField(default=0)
+    server_log = fields.BigIntField(default=0)
+    suggestions = fields.BigIntField(default=0)
     repo = fields.CharField(50, null=True)
 
-    @classmethod
-    async def get_text_channel(
-        cls, guild: Guild, field_name: str
-    ) -> TextChannel | None:
-        """Return the text channel from a guild set to the given field."""
-        guild_data, _ = await cls.get_or_create(id=guild.id)
-        if channel_id := getattr(guild_data, field_name):
-            channel = guild.get_channel(channel_id)
-            return channel if isinstance(channel, TextChannel) else None
-
     class Meta:
         table = "guilds"
 
@@ -29,8 +18,8 @@ class GuildModel(Model):
 class TagModel(Model):
     name = fields.TextField()
     created_at = fields.DatetimeField(null=True, auto_now_add=True)
-    author_id = fields.IntField()
-    guild_id = fields.IntField()
+    author_id = fields.BigIntField()
+    guild_id = fields.BigIntField()
     content = fields.TextField()
     uses = fields.IntField()
 
@@ -39,15 +28,25 @@ class TagModel(Model):
 
     class Meta:
         table = "tags"
+        unique_together = (("guild_id", "name"),)
 
 
 class WarnModel(Model):
     id = fields.IntField(pk=True)
     created_at = fields.DatetimeField(null=True, auto_now_add=True)
-    mod_id = fields.IntField()
-    target_id = fields.IntField()
-    guild_id = fields.IntField()
+    mod_id = fields.BigIntField()
+    target_id = fields.BigIntField()
+    guild_id = fields.BigIntField()
     reason = fields.TextField()
 
     class Meta:
         table = "warns"
+        indexes = (("guild_id", "target_id"),)
+
+
+class GuildPurgeModel(Model):
+    guild_id = fields.BigIntField(pk=True)
+    purge_at = fields.DatetimeField()
+
+    class Meta:
+        table = "guild_purges"
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+from datetime import timedelta
+from os import getenv
+
+from discord.utils import utcnow
+from tortoise.expressions import Subquery
+from tortoise.transactions import in_transaction
+
+from .models import GuildModel, GuildPurgeModel, TagModel, WarnModel
+
+__all__ = ("GuildPurger",)
+
+log = logging.getLogger(__name__)
+
+
+class GuildPurger:
+    """Deletes the data of guilds the bot was removed from after a grace period.
+
+    Purges are stored in the database, so they're resumed after a restart and
+    cancelled if the bot is added back before they're due, even while it was
+    offline. Rows are deleted in batches of `batch_size`, each in its own short
+    transaction, so other writes aren't blocked for long. The grace period is
+    read from `GUILD_PURGE_GRACE` (seconds) and defaults to a week.
+    """
+
+    MODELS = (TagModel, WarnModel)
+
+    def __init__(
+        self,
+        bot,
+        *,
+        grace: float | None = None,
+        batch_size: int = 500,
+        interval: float = 60 * 60,
+    ) -> None:
+        if grace is None:
+            grace = float(getenv("GUILD_PURGE_GRACE", 7 * 24 * 60 * 60))
+        self.grace = timedelta(seconds=grace)
+        self.bot = bot
+        self.batch_size = batch_size
+        self.interval = interval
+        self.task: asyncio.Task | None = None
+        self.wake = asyncio.Event()
+
+    async def schedule(self, guild_id: int) -> None:
+        await GuildPurgeModel.update_or_create(
+            guild_id=guild_id, defaults={"purge_at": utcnow() + self.grace}
+        )
+        # the worker may be sleeping past the time this purge is due
+        self.wake.set()
+
+    async def cancel(self, guild_id: int) -> None:
+        await GuildPurgeModel.filter(guild_id=guild_id).delete()
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    def stop(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def run(self) -> None:
+        # guilds are only known once the bot is ready
+        await self.bot.wait_until_ready()
+        while True:
+            delay = self.interval
+            try:
+                await self.purge_due()
+                next_purge = await GuildPurgeModel.all().order_by("purge_at").first()
+                if next_purge:
+                    delay = min(delay, (next_purge.purge_at - utcnow()).total_seconds())
+            except Exception:
+                log.exception("Failed to purge the data of removed guilds")
+            self.wake.clear()
+            try:
+                await asyncio.wait_for(self.wake.wait(), max(delay, 1))
+            except asyncio.TimeoutError:
+                pass
+
+    async def purge_due(self) -> int:
+        """Purge every guild whose grace period is over, returning how many."""
+        guild_ids = await GuildPurgeModel.filter(purge_at__lte=utcnow()).values_list(
+            "guild_id", flat=True
+        )
+        purged = 0
+        for guild_id in guild_ids:
+            try:
+                # values_list returns ints
+                purged += await self.purge(guild_id)  # type: ignore
+            except Exception:
+                log.exception("Failed to purge the data of guild %s", guild_id)
+                # retry later rather than every time the worker wakes up
+                await GuildPurgeModel.filter(guild_id=guild_id).update(
+                    purge_at=utcnow() + timedelta(seconds=self.interval)
+                )
+        return purged
+
+    async def purge(self, guild_id: int) -> bool:
+        """Delete all data of a guild, returning whether it was completed."""
+        # the bot may have been added back while it was offline
+        if self.bot.get_guild(guild_id) is not None:
+            await self.cancel(guild_id)
+            return False
+        for model in self.MODELS:
+            while True:
+                # stop if the purge was cancelled in the meantime
+                if not await GuildPurgeModel.exists(guild_id=guild_id):
+                    return False
+                async with in_transaction():
+                    deleted = await model.filter(
+                        id__in=Subquery(
+                            model.filter(guild_id=guild_id)
+                            .limit(self.batch_size)
+                            .values("id")
+                        )
+                    ).delete()
+                if deleted < self.batch_size:
+                    break
+                # let other writers in between batches
+                await asyncio.sleep(0)
+
+        async with in_transaction():
+            if not await GuildPurgeModel.filter(guild_id=guild_id).delete():
+                return False
+            await GuildModel.filter(id=guild_id).delete()
+        return True
@@ -0,0 +1,276 @@
+import asyncio
+import logging
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from os import getenv
+
+from tortoise.expressions import F
+from tortoise.transactions import in_transaction
+
+from .models import TagModel
+from .utils import SingleFlight
+
+__all__ = ("GuildTagNames", "TagContentCache", "TagNameIndex", "TagUsageBuffer")
+
+log = logging.getLogger(__name__)
+
+
+class TagUsageBuffer:
+    """Counts tag uses in memory and adds them to the database periodically.
+
+    Every tag with pending uses is updated with a single `uses = uses + n`
+    statement, all in one transaction. The interval is read from
+    `TAG_USES_FLUSH_INTERVAL` (seconds) and defaults to a minute. Tags renamed
+    while a flush is running get the uses it couldn't write under their old name.
+    """
+
+    def __init__(self, interval: float | None = None) -> None:
+        self.interval = interval or float(getenv("TAG_USES_FLUSH_INTERVAL", 60))
+        self.pending: Counter[tuple[int, str]] = Counter()
+        self.task: asyncio.Task | None = None
+        # the renames made during a flush, by the old key
+        self.renames: dict[tuple[int, str], tuple[int, str]] | None = None
+
+    def add(self, guild_id: int, name: str) -> None:
+        self.pending[guild_id, name] += 1
+
+    def get(self, guild_id: int, name: str) -> int:
+        """Return the uses of a tag that haven't been written yet."""
+        return self.pending[guild_id, name]
+
+    def rename(self, guild_id: int, name: str, new_name: str) -> None:
+        if uses := self.pending.pop((guild_id, name), 0):
+            self.pending[guild_id, new_name] += uses
+        if self.renames is not None:
+            for old, new in self.renames.items():
+                if new == (guild_id, name):
+                    self.renames[old] = guild_id, new_name
+            self.renames[guild_id, name] = guild_id, new_name
+
+    def discard(self, guild_id: int, name: str) -> None:
+        self.pending.pop((guild_id, name), None)
+
+    async def flush(self) -> None:
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, Counter()
+        self.renames = {}
+        missed: Counter[tuple[int, str]] = Counter()
+        try:
+            async with in_transaction():
+                for (guild_id, name), uses in pending.items():
+                    updated = await TagModel.filter(
+                        guild_id=guild_id, name=name
+                    ).update(uses=F("uses") + uses)
+                    if not updated:
+                        missed[guild_id, name] = uses
+        except Exception:
+            # keep the uses for the next flush
+            for key, uses in pending.items():
+                self.pending[self.renames.get(key, key)] += uses
+            raise
+        finally:
+            renames, self.renames = self.renames, None
+        # tags renamed in the meantime weren't found, others were deleted
+        for key, uses in missed.items():
+            if key in renames:
+                self.pending[renames[key]] += uses
+
+    def start(self) -> None:
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.flush()
+            except Exception:
+                # the uses are kept, try again after the next interval
+                log.exception("Failed to flush %d tag uses", len(self.pending))
+
+    async def close(self) -> None:
+        """Stop flushing periodically and write the pending uses."""
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        await self.flush()
+
+
+class GuildTagNames:
+    """The sorted tag names of a guild and the trigrams they contain."""
+
+    __slots__ = ("names", "trigrams")
+
+    def __init__(self, names=()) -> None:
+        self.names: list[str] = sorted(names)
+        self.trigrams: dict[str, set[str]] = {}
+        for name in self.names:
+            self._index(name)
+
+    @staticmethod
+    def _trigrams(text: str) -> set[str]:
+        return {text[i : i + 3] for i in range(len(text) - 2)}
+
+    def _index(self, name: str) -> None:
+        for trigram in self._trigrams(name):
+            self.trigrams.setdefault(trigram, set()).add(name)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def add(self, name: str) -> None:
+        i = bisect_left(self.names, name)
+        if i == len(self.names) or self.names[i] != name:
+            self.names.insert(i, name)
+            self._index(name)
+
+    def remove(self, name: str) -> None:
+        i = bisect_left(self.names, name)
+        if i < len(self.names) and self.names[i] == name:
+            del self.names[i]
+            for trigram in self._trigrams(name):
+                if (names := self.trigrams.get(trigram)) is not None:
+                    names.discard(name)
+                    if not names:
+                        del self.trigrams[trigram]
+
+    def search(self, query: str, limit: int | None = None) -> list[str]:
+        """Return the sorted names containing the query."""
+        if len(query) < 3:
+            # too short to have a trigram, but every name has to be checked anyway
+            matches = [name for name in self.names if query in name]
+        else:
+            trigrams = sorted(
+                (
+                    self.trigrams.get(trigram, set())
+                    for trigram in self._trigrams(query)
+                ),
+                key=len,
+            )
+            candidates = set.intersection(*trigrams)
+            matches = sorted(name for name in candidates if query in name)
+        return matches[:limit]
+
+
+class TagNameIndex:
+    """Keeps the tag names of guilds in memory for autocomplete and search.
+
+    A guild's names are loaded with a names-only query when they're first
+    needed, then kept current by `add`, `remove` and `rename`.
+    """
+
+    def __init__(self) -> None:
+        self.guilds: dict[int, GuildTagNames] = {}
+        self.flights = SingleFlight()
+        # guilds changed while their names were loading
+        self.stale: set[int] = set()
+
+    async def _load(self, guild_id: int) -> GuildTagNames:
+        self.stale.discard(guild_id)
+        names = GuildTagNames(
+            await TagModel.filter(guild_id=guild_id).values_list("name", flat=True)
+        )
+        if guild_id not in self.stale:
+            self.guilds[guild_id] = names
+        return names
+
+    async def get(self, guild_id: int) -> GuildTagNames:
+        if (names := self.guilds.get(guild_id)) is None:
+            names = await self.flights.run(guild_id, self._load, guild_id)
+        return names
+
+    def _changed(self, guild_id: int) -> GuildTagNames | None:
+        if guild_id in self.flights.calls:
+            self.stale.add(guild_id)
+        return self.guilds.get(guild_id)
+
+    def add(self, guild_id: int, name: str) -> None:
+        if (names := self._changed(guild_id)) is not None:
+            names.add(name)
+
+    def remove(self, guild_id: int, name: str) -> None:
+        if (names := self._changed(guild_id)) is not None:
+            names.remove(name)
+
+    def rename(self, guild_id: int, name: str, new_name: str) -> None:
+        if (names := self._changed(guild_id)) is not None:
+            names.remove(name)
+            names.add(new_name)
+
+    def discard(self, guild_id: int) -> None:
+        self._changed(guild_id)
+        self.guilds.pop(guild_id, None)
+
+
+class TagContentCache:
+    """An LRU cache of tag contents with a byte budget.
+
+    The budget is read from `TAG_CACHE_BYTES` and defaults to 4 MiB. Commands
+    that change a tag have to invalidate it.
+    """
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        self.max_bytes = max_bytes or int(getenv("TAG_CACHE_BYTES", 4 * 2**20))
+        self.tags: OrderedDict[tuple[int, str], str] = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        # bumped by every invalidation, so contents loaded before it aren't cached
+        self.generation = 0
+
+    @staticmethod
+    def _size(key: tuple[int, str], content: str) -> int:
+        return len(key[1].encode()) + len(content.encode())
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / ((self.hits + self.misses) or 1)
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "tags": len(self.tags),
+            "bytes": self.size,
+        }
+
+    def _store(self, key: tuple[int, str], content: str) -> None:
+        if (size := self._size(key, content)) > self.max_bytes:
+            return
+        self.tags[key] = content
+        self.size += size
+        while self.size > self.max_bytes:
+            self.size -= self._size(*self.tags.popitem(last=False))
+
+    async def get(self, guild_id: int, name: str) -> str | None:
+        """Return the content of a tag, or `None` if it doesn't exist."""
+        key = guild_id, name
+        if (content := self.tags.get(key)) is not None:
+            self.tags.move_to_end(key)
+            self.hits += 1
+            return content
+
+        self.misses += 1
+        generation = self.generation
+        contents = await TagModel.filter(guild_id=guild_id, name=name).values_list(
+            "content", flat=True
+        )
+        if not contents:
+            return None
+        content: str = contents[0]  # type: ignore # values_list returns strings
+        if generation == self.generation and key not in self.tags:
+            self._store(key, content)
+        return content
+
+    def invalidate(self, guild_id: int, name: str) -> None:
+        self.generation += 1
+        if (content := self.tags.pop((guild_id, name), None)) is not None:
+            self.size -= self._size((guild_id, name), content)
+
+    def discard(self, guild_id: int) -> None:
+        """Remove the tags of a guild."""
+        for key in [key for key in self.tags if key[0] == guild_id]:
+            self.invalidate(*key)
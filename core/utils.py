@@ -1,5 +1,6 @@
+import asyncio
 from datetime import timedelta
-from typing import Any, Literal
+from typing import Any, Hashable, Literal
 
 from discord import DiscordException
 from discord.ext import commands
@@ -10,6 +11,7 @@ __all__ = (
     "humanize_time",
     "Lowercase",
     "BotMissingPermissions",
+    "SingleFlight",
 )
 
 
@@ -46,6 +48,24 @@ def humanize_time(time: timedelta) -> str:
     return f"{seconds} second{s(seconds)}"
 
 
+# concurrency
+class SingleFlight:
+    """Runs concurrent calls with the same key only once and shares their result."""
+
+    def __init__(self) -> None:
+        self.calls: dict[Hashable, asyncio.Task] = {}
+        self.coalesced = 0
+
+    async def run(self, key: Hashable, func, *args):
+        if task := self.calls.get(key):
+            self.coalesced += 1
+        else:
+            task = self.calls[key] = asyncio.create_task(func(*args))
+            task.add_done_callback(lambda _: self.calls.pop(key, None))
+        # a cancelled caller shouldn't cancel the call for the others
+        return await asyncio.shield(task)
+
+
 # converters
 class _Lowercase(commands.Converter):
     async def convert(self, ctx, text):